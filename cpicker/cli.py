@@ -1,19 +1,32 @@
 """Command-line interface for cPicker."""
 
 import sys
+import math
 import argparse
 from PyQt6.QtWidgets import QApplication
 
 from . import __version__
 from .picker_overlay import PickerOverlay
 from .utils.instance_lock import InstanceLock
+from .utils.color import PALETTE_FORMATS
+from .utils.color_management import COLOR_SPACES
+from .utils.vision import CVD_MODES
+from .utils.gradient import DEFAULT_TOLERANCE
+from .utils.config import CONFIG_PATH, get_config
+from .utils.metrics import METRICS, flush_metrics, load_metrics, write_textfile
 
 
 def main():
     """Main entry point for cPicker."""
+    # Defaults come from the config file; flags override them per run
+    config = get_config()
+    output = config["output"]
+    sampling = config["sampling"]
+
     parser = argparse.ArgumentParser(
         description='cPicker - Lightweight Linux color picker tool',
-        prog='cpicker'
+        prog='cpicker',
+        epilog=f'Defaults can be changed in {CONFIG_PATH}'
     )
 
     parser.add_argument(
@@ -22,22 +35,211 @@ def main():
         version=f'cPicker {__version__}'
     )
 
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['stats'],
+        help='stats: show runtime counters collected across runs'
+    )
+
     parser.add_argument(
         '--ui',
         action='store_true',
         help='Launch color picker overlay (default action)'
     )
 
+    parser.add_argument(
+        '--textfile',
+        metavar='PATH',
+        help='With stats: write counters as a Prometheus textfile instead of printing'
+    )
+
+    mode_group = parser.add_mutually_exclusive_group()
+
+    mode_group.add_argument(
+        '--session', '-s',
+        action='store_true',
+        help='Pick multiple colors: click to add, Enter to copy all, Escape to abort'
+    )
+
+    mode_group.add_argument(
+        '--gradient', '-g',
+        action='store_true',
+        help='Drag a line to copy a CSS linear-gradient() of the pixels along it'
+    )
+
+    parser.add_argument(
+        '--format', '-f',
+        choices=PALETTE_FORMATS,
+        default=output["palette_format"],
+        help=f'Palette format copied at the end of a session (default: {output["palette_format"]})'
+    )
+
+    parser.add_argument(
+        '--color-space',
+        choices=COLOR_SPACES,
+        default=output["color_space"] or None,
+        help='Convert picked colors from the display profile to this color space'
+    )
+
+    parser.add_argument(
+        '--icc-profile',
+        metavar='PATH',
+        default=output["icc_profile"] or None,
+        help='Display ICC profile (default: _ICC_PROFILE root window property)'
+    )
+
+    parser.add_argument(
+        '--grab',
+        action=argparse.BooleanOptionalAction,
+        help='Grab pointer/keyboard instead of a fullscreen overlay (lower compositor load; '
+             'default from performance.input_backend, not available with --gradient)'
+    )
+
+    parser.add_argument(
+        '--simulate',
+        choices=CVD_MODES,
+        default=sampling["vision_mode"] or None,
+        help='Start with a color vision deficiency simulation (press V to cycle)'
+    )
+
+    parser.add_argument(
+        '--kernel',
+        type=odd_kernel,
+        default=sampling["gradient_kernel"],
+        metavar='N',
+        help=f'Average N×N pixels (N odd) around each gradient sample (default: {sampling["gradient_kernel"]})'
+    )
+
+    parser.add_argument(
+        '--tolerance',
+        type=non_negative_float,
+        default=sampling["gradient_tolerance"],
+        metavar='DE',
+        help=f'Maximum ΔE between gradient and sampled pixels (default: {sampling["gradient_tolerance"]:g})'
+    )
+
     args = parser.parse_args()
 
+    if args.command == 'stats':
+        show_stats(args.textfile)
+        return
+
+    # Gradient mode draws its drag line on the overlay window, which grab
+    # mode never shows; a configured grab backend falls back to the overlay
+    input_grab = args.grab
+    if input_grab is None:
+        input_grab = config["performance"]["input_backend"] == "grab" and not args.gradient
+    elif input_grab and args.gradient:
+        parser.error("argument --grab: not allowed with argument --gradient/-g")
+
+    # A display profile alone implies conversion to sRGB
+    color_space = args.color_space
+    if args.icc_profile and not color_space:
+        color_space = 'srgb'
+
     # Default action is to launch UI
-    launch_picker()
+    launch_picker(
+        session=args.session,
+        output_format=args.format,
+        color_space=color_space,
+        icc_profile=args.icc_profile,
+        input_grab=input_grab,
+        vision_mode=args.simulate,
+        gradient=args.gradient,
+        gradient_kernel=args.kernel,
+        gradient_tolerance=args.tolerance
+    )
+
+
+def odd_kernel(value: str) -> int:
+    """
+    Parse a gradient averaging kernel size.
+
+    Args:
+        value: Command-line value
 
+    Returns:
+        Kernel side length
 
-def launch_picker():
-    """Launch the color picker overlay."""
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an odd integer >= 1
+    """
+    try:
+        kernel = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if kernel < 1 or kernel % 2 == 0:
+        raise argparse.ArgumentTypeError(
+            f"must be an odd integer >= 1 so samples stay centered, got {kernel}"
+        )
+    return kernel
+
+
+def non_negative_float(value: str) -> float:
+    """
+    Parse a gradient ΔE tolerance.
+
+    Args:
+        value: Command-line value
+
+    Returns:
+        Tolerance
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is negative or not finite
+    """
+    try:
+        tolerance = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not math.isfinite(tolerance) or tolerance < 0:
+        raise argparse.ArgumentTypeError(
+            f"must be a finite number >= 0, got {value}"
+        )
+    return tolerance
+
+
+def show_stats(textfile: str = None):
+    """
+    Print runtime counters, or write them as a Prometheus textfile.
+
+    Args:
+        textfile: Output .prom path (e.g., for node-exporter's textfile collector)
+    """
+    metrics = load_metrics()
+    if textfile:
+        try:
+            write_textfile(metrics, textfile)
+        except OSError as e:
+            print(f"Error writing {textfile}: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        print(metrics.format_text())
+
+
+def launch_picker(session: bool = False, output_format: str = 'hex',
+                  color_space: str = None, icc_profile: str = None,
+                  input_grab: bool = False, vision_mode: str = None,
+                  gradient: bool = False, gradient_kernel: int = 1,
+                  gradient_tolerance: float = DEFAULT_TOLERANCE):
+    """
+    Launch the color picker overlay.
+
+    Args:
+        session: Collect multiple picks before copying
+        output_format: Palette format used when a session is copied
+        color_space: Convert picked colors to this space (None = raw values)
+        icc_profile: Display ICC profile path
+        input_grab: Grab pointer/keyboard instead of showing the overlay
+        vision_mode: Initial color vision simulation
+        gradient: Drag a line to copy a CSS gradient
+        gradient_kernel: Averaging window side for line samples
+        gradient_tolerance: Maximum ΔE between gradient and sampled pixels
+    """
     # Use instance lock to prevent multiple instances
     with InstanceLock():
+        METRICS.mark_activation()
         try:
             # Create QApplication
             app = QApplication(sys.argv)
@@ -45,7 +247,17 @@ def launch_picker():
             app.setOrganizationName("cPicker")
 
             # Create and show picker overlay
-            picker = PickerOverlay()
+            picker = PickerOverlay(
+                session=session,
+                output_format=output_format,
+                color_space=color_space,
+                icc_profile=icc_profile,
+                input_grab=input_grab,
+                vision_mode=vision_mode,
+                gradient=gradient,
+                gradient_kernel=gradient_kernel,
+                gradient_tolerance=gradient_tolerance
+            )
 
             # Run application
             sys.exit(app.exec())
@@ -54,6 +266,10 @@ def launch_picker():
             print(f"Error launching cPicker: {e}", file=sys.stderr)
             sys.exit(1)
 
+        finally:
+            # Persist this run's counters for `cpicker stats`
+            flush_metrics()
+
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,58 @@
 """Main color picker overlay window."""
 
+import time
+from typing import List, Optional, Tuple
+import numpy as np
 from PyQt6.QtWidgets import QWidget, QApplication
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPainter
-from Xlib import display as xlib_display
-
-from .utils.capture import capture_screen_region
+from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtGui import QPainter, QPen
+from Xlib import X
+
+from .utils.capture import capture_screen_region, get_screen_capture
+from .utils.color_management import ColorTransform, load_display_profile
+from .utils.x_connection import get_x_connection, close_x_connection
+from .utils.input_grab import InputGrab
+from .utils.vision import CVD_LABELS, next_cvd_mode, simulate_cvd
+from .utils.contrast import CONTRAST_MODES, contrast_heatmap, format_contrast
+from .utils.gradient import (
+    DEFAULT_TOLERANCE, line_points, sample_line, simplify_stops, css_angle, css_linear_gradient
+)
 from .utils.magnifier import MagnifierWidget
 from .utils.clipboard import copy_text_to_clipboard
-from .utils.color import rgb_to_hex
-from .utils.theme import SOURCE_SIZE
+from .utils.color import rgb_to_hex, format_color, format_color_list
+from .utils.metrics import METRICS
+from .utils.theme import SOURCE_SIZE, THEME_BLUE_SOLID
+from .utils.config import get_config
+
+
+# Magnifier refresh interval (default 30ms = ~33 FPS) and shortcut release
+# polling interval, both tunable per machine in the config file
+UPDATE_INTERVAL_MS = get_config()["performance"]["refresh_ms"]
+KEY_POLL_INTERVAL_MS = get_config()["performance"]["key_poll_ms"]
+
+# Retry grabs for up to ~0.5s (the activation shortcut may still hold a grab)
+GRAB_RETRY_INTERVAL_MS = 20
+GRAB_RETRY_LIMIT = 25
+
+# Shorter drags count as a plain click in gradient mode
+GRADIENT_MIN_DRAG = 3
+
+# Time for the compositor to drop the drag line and magnifier before capture
+GRADIENT_CAPTURE_DELAY_MS = 50
+
+# X keysyms/buttons handled while input is grabbed, mapped to Qt equivalents
+X_KEYS = {
+    0xff1b: Qt.Key.Key_Escape,   # Escape
+    0xff0d: Qt.Key.Key_Return,   # Return
+    0xff8d: Qt.Key.Key_Enter,    # KP_Enter
+    0x0076: Qt.Key.Key_V,        # v
+    0x0068: Qt.Key.Key_H,        # h
+    0x006c: Qt.Key.Key_L,        # l
+}
+X_BUTTONS = {
+    1: Qt.MouseButton.LeftButton,
+    3: Qt.MouseButton.RightButton,
+}
 
 
 class PickerOverlay(QWidget):
@@ -18,10 +61,42 @@ class PickerOverlay(QWidget):
 
     Workflow: Press Super+Shift+C to activate, hold keys to keep active,
     release keys (or click) to copy color and close.
+
+    Session mode: each left click adds the color to a palette, Enter copies
+    the whole palette in the chosen format, Escape aborts without copying.
+
+    Press V to cycle color vision deficiency simulations of the magnified
+    area and swatch; the copied color is always the real one. Press H to
+    cycle the WCAG/APCA contrast heatmap against the center color, L to
+    lock the current color as the contrast reference.
+
+    Gradient mode: drag a line to copy a CSS linear-gradient() whose stops
+    reproduce the pixels along the line within a ΔE tolerance.
+
+    Grab mode: instead of showing the fullscreen window, pointer and
+    keyboard are grabbed on the root window so only the magnifier is
+    composited. Falls back to the overlay window if the grab fails.
     """
 
-    def __init__(self):
-        """Initialize picker overlay."""
+    def __init__(self, session: bool = False, output_format: str = "hex",
+                 color_space: Optional[str] = None, icc_profile: Optional[str] = None,
+                 input_grab: bool = False, vision_mode: Optional[str] = None,
+                 gradient: bool = False, gradient_kernel: int = 1,
+                 gradient_tolerance: float = DEFAULT_TOLERANCE):
+        """
+        Initialize picker overlay.
+
+        Args:
+            session: Collect multiple picks before copying
+            output_format: Palette format used when a session is copied
+            color_space: Convert picked colors to this space (None = raw values)
+            icc_profile: Display ICC profile path (default: _ICC_PROFILE)
+            input_grab: Grab pointer/keyboard instead of showing the overlay
+            vision_mode: Initial color vision simulation (None = off)
+            gradient: Drag a line to copy a CSS gradient
+            gradient_kernel: Averaging window side for line samples (1 = exact)
+            gradient_tolerance: Maximum ΔE between samples and gradient
+        """
         super().__init__()
 
         # Window configuration
@@ -46,42 +121,166 @@ class PickerOverlay(QWidget):
         self.current_g = 0
         self.current_b = 0
 
+        # Session state (multi-pick mode)
+        self.session = session
+        self.output_format = output_format
+        self.session_colors: List[Tuple[str, int, int, int]] = []
+
+        # Gradient state (line sampling mode)
+        self.gradient = gradient
+        self.gradient_kernel = gradient_kernel
+        self.gradient_tolerance = gradient_tolerance
+        self.drag_start: Optional[Tuple[int, int]] = None
+
         # Keyboard state tracking for press-hold-release workflow
-        self.x_display = None
+        # (session and gradient modes end on click/Enter/Escape instead)
+        self.x_connection = None
         self.shortcut_keys_held = False
-        self.monitoring_release = True
+        self.monitoring_release = not (session or gradient)
 
-        # Initialize X11 display for keyboard state monitoring
-        try:
-            self.x_display = xlib_display.Display()
-        except Exception as e:
-            print(f"Warning: Cannot monitor keyboard state: {e}")
-            self.monitoring_release = False
+        # Use the shared X11 connection for keyboard state monitoring
+        if self.monitoring_release:
+            try:
+                self.x_connection = get_x_connection()
+                # Resolve shortcut keycodes once (cached by the connection)
+                self.super_keycodes = {self.x_connection.keycode(0xffeb),   # Super_L
+                                       self.x_connection.keycode(0xffec)}   # Super_R
+                self.shift_keycodes = {self.x_connection.keycode(0xffe1),   # Shift_L
+                                       self.x_connection.keycode(0xffe2)}   # Shift_R
+                self.c_keycodes = {self.x_connection.keycode(0x63)}         # c
+            except Exception as e:
+                print(f"Warning: Cannot monitor keyboard state: {e}")
+                self.monitoring_release = False
 
         # Create magnifier widget
-        self.magnifier = MagnifierWidget()
+        self.magnifier = MagnifierWidget(show_palette=session)
         self.magnifier.show()
 
+        # Color management (LUT is built or loaded once, before the first frame)
+        self.color_transform: Optional[ColorTransform] = None
+        if color_space:
+            self.color_transform = self._load_color_transform(color_space, icc_profile)
+        self.color_space = "srgb"
+        if self.color_transform:
+            self.magnifier.set_color_space(self.color_transform.label)
+            self.color_space = self.color_transform.target
+
+        # Color vision deficiency simulation (magnifier display only)
+        self.vision_mode: Optional[str] = None
+        self._set_vision_mode(vision_mode)
+
+        # Contrast heatmap against the locked (or center) color
+        self.contrast_mode: Optional[str] = None
+        self.locked_rgb: Optional[Tuple[int, int, int]] = None
+
         # Update timer to limit capture frequency (30ms = ~33 FPS)
         # Only captures 21×21 pixels = 441 pixels per frame (very efficient)
+        self.last_frame_time: Optional[float] = None
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self._update_color)
-        self.update_timer.start(30)
+        self.update_timer.start(UPDATE_INTERVAL_MS)
 
-        # Keyboard state monitoring timer (check every 50ms)
+        # Keyboard state monitoring timer
         if self.monitoring_release:
             self.key_monitor_timer = QTimer()
             self.key_monitor_timer.timeout.connect(self._check_shortcut_release)
-            self.key_monitor_timer.start(50)
+            self.key_monitor_timer.start(KEY_POLL_INTERVAL_MS)
+
+        # Initial position (center of screen in global coordinates)
+        self.cursor_x = screen.x() + screen.width() // 2
+        self.cursor_y = screen.y() + screen.height() // 2
 
-        # Show and activate
+        # Input grab instead of the fullscreen overlay window
+        self.input_grab: Optional[InputGrab] = None
+        if input_grab and self.gradient:
+            # The drag line is painted on the overlay window
+            print("Warning: Gradient mode needs the overlay window, ignoring input grab")
+        elif input_grab:
+            try:
+                self.input_grab = InputGrab()
+                self.cursor_x, self.cursor_y = self.input_grab.pointer_position()
+            except Exception as e:
+                print(f"Warning: Cannot grab input, using overlay window: {e}")
+                self.input_grab = None
+
+        if self.input_grab:
+            self.grab_attempts = 0
+            self.grab_retry_timer = QTimer()
+            self.grab_retry_timer.timeout.connect(self._try_input_grab)
+            self.grab_retry_timer.start(GRAB_RETRY_INTERVAL_MS)
+            self._try_input_grab()
+
+            # Grabbed events arrive on the X connection, not through Qt
+            self.grab_event_timer = QTimer()
+            self.grab_event_timer.timeout.connect(self._process_grab_events)
+            self.grab_event_timer.start(10)
+        else:
+            self._show_overlay()
+
+    def _show_overlay(self):
+        """Show and activate the fullscreen overlay window."""
         self.show()
         self.activateWindow()
         self.setFocus()
 
-        # Initial position (center of screen in global coordinates)
-        self.cursor_x = screen.x() + screen.width() // 2
-        self.cursor_y = screen.y() + screen.height() // 2
+    def _try_input_grab(self):
+        """Try to grab pointer and keyboard (called by retry timer)."""
+        if not self.input_grab:
+            self.grab_retry_timer.stop()
+            return
+
+        self.grab_attempts += 1
+        try:
+            self.input_grab.grab_pointer()
+            self.input_grab.grab_keyboard()
+        except Exception as e:
+            METRICS.inc("x_errors")
+            print(f"Error grabbing input: {e}")
+
+        if self.input_grab.pointer_grabbed and self.input_grab.keyboard_grabbed:
+            self.grab_retry_timer.stop()
+        elif self.grab_attempts >= GRAB_RETRY_LIMIT:
+            self.grab_retry_timer.stop()
+            # Sessions can only be copied with Enter, so they need the keyboard
+            if not self.input_grab.pointer_grabbed or self.session:
+                device = "pointer" if not self.input_grab.pointer_grabbed else "keyboard"
+                print(f"Warning: Cannot grab {device}, using overlay window")
+                self.input_grab.release()
+                self.input_grab = None
+                self._show_overlay()
+            else:
+                print("Warning: Cannot grab keyboard, Escape/Enter unavailable")
+
+    def _process_grab_events(self):
+        """Dispatch pointer and key events received through the input grab."""
+        if not self.input_grab:
+            return
+
+        try:
+            events = self.input_grab.poll_events()
+        except Exception as e:
+            METRICS.inc("x_errors")
+            print(f"Error reading grabbed input: {e}")
+            return
+
+        for event in events:
+            if event.type == X.MotionNotify:
+                self.cursor_x = event.root_x
+                self.cursor_y = event.root_y
+            elif event.type == X.ButtonPress:
+                button = X_BUTTONS.get(event.detail)
+                if button:
+                    self._handle_button_press(button)
+            elif event.type == X.ButtonRelease:
+                button = X_BUTTONS.get(event.detail)
+                if button:
+                    self._handle_button_release(button)
+            elif event.type == X.KeyRelease:
+                self._handle_key_release(X_KEYS.get(self.input_grab.keysym(event.detail)))
+
+            # Picker was closed by this event
+            if not self.input_grab:
+                break
 
     def mouseMoveEvent(self, event):
         """
@@ -96,8 +295,20 @@ class PickerOverlay(QWidget):
         self.cursor_x = global_pos.x()
         self.cursor_y = global_pos.y()
 
+        # Redraw the drag line
+        if self.drag_start:
+            self.update()
+
     def _update_color(self):
         """Update color from current cursor position (called by timer)."""
+        # Count ticks the event loop was too busy to deliver
+        now = time.perf_counter()
+        if self.last_frame_time is not None:
+            missed = int((now - self.last_frame_time) * 1000 / UPDATE_INTERVAL_MS) - 1
+            if missed > 0:
+                METRICS.inc("frames_skipped", missed)
+        self.last_frame_time = now
+
         # Capture 21×21 pixel area around cursor
         # This is very efficient - only 441 pixels per frame
         half_size = SOURCE_SIZE // 2
@@ -112,48 +323,130 @@ class PickerOverlay(QWidget):
             # Get center pixel color (middle of 21×21 grid)
             center = SOURCE_SIZE // 2
             try:
-                r, g, b = source_image.getpixel((center, center))
+                raw_rgb = source_image.getpixel((center, center))
+                r, g, b = raw_rgb
+                if self.color_transform:
+                    r, g, b = self.color_transform.apply(r, g, b)
                 self.current_r = r
                 self.current_g = g
                 self.current_b = b
                 self.current_hex = rgb_to_hex(r, g, b)
 
+                # Contrast heatmap (on output values, before any simulation)
+                if self.contrast_mode:
+                    self._update_contrast(source_image, (r, g, b))
+
+                # Simulate color vision deficiency on the whole buffer in one pass
+                display_image = source_image
+                if self.vision_mode:
+                    display_image = simulate_cvd(source_image, self.vision_mode)
+                    raw_rgb = display_image.getpixel((center, center))
+
                 # Update magnifier
-                self.magnifier.update_source(source_image)
-                self.magnifier.set_color(self.current_hex, r, g, b)
+                self.magnifier.update_source(display_image)
+                self.magnifier.set_color(self.current_hex, r, g, b, swatch_rgb=raw_rgb)
                 self.magnifier.position_near_cursor(self.cursor_x, self.cursor_y)
 
+                METRICS.inc("frames_captured")
+                METRICS.mark_first_frame()
+
             except Exception as e:
+                METRICS.inc("frames_skipped")
                 print(f"Error getting pixel color: {e}")
+        else:
+            METRICS.inc("frames_skipped")
+
+    def _set_vision_mode(self, mode: Optional[str]):
+        """
+        Set the color vision simulation shown in the magnifier.
+
+        Args:
+            mode: One of CVD_MODES, or None to turn simulation off
+        """
+        self.vision_mode = mode
+        self.magnifier.set_vision_label(CVD_LABELS[mode] if mode else None)
+
+    def _update_contrast(self, source_image, center_rgb: Tuple[int, int, int]):
+        """
+        Recompute the contrast heatmap for the captured area.
+
+        Args:
+            source_image: Captured PIL RGB Image
+            center_rgb: Output color of the center pixel
+        """
+        pixels = np.asarray(source_image)
+        if self.color_transform:
+            pixels = self.color_transform.apply_array(pixels)
+
+        reference = self.locked_rgb or center_rgb
+        status, worst = contrast_heatmap(pixels, reference, self.contrast_mode)
+        summary = format_contrast(worst, self.contrast_mode)
+        if self.locked_rgb:
+            summary = f"[L] {summary}"
+        self.magnifier.set_heatmap(status, summary)
+
+    def _cycle_contrast_mode(self):
+        """Cycle contrast heatmap: off -> WCAG -> APCA -> off."""
+        if self.contrast_mode is None:
+            self.contrast_mode = CONTRAST_MODES[0]
+        else:
+            index = CONTRAST_MODES.index(self.contrast_mode) + 1
+            self.contrast_mode = CONTRAST_MODES[index] if index < len(CONTRAST_MODES) else None
+
+        if self.contrast_mode is None:
+            self.magnifier.set_heatmap(None)
+
+    def _toggle_contrast_lock(self):
+        """Lock the current color as contrast reference, or unlock it."""
+        if self.locked_rgb:
+            self.locked_rgb = None
+        else:
+            self.locked_rgb = (self.current_r, self.current_g, self.current_b)
+
+    def _load_color_transform(self, color_space: str,
+                              icc_profile: Optional[str]) -> Optional[ColorTransform]:
+        """
+        Build the display-to-output color transform.
+
+        Args:
+            color_space: Output color space
+            icc_profile: Display ICC profile path, or None for _ICC_PROFILE
+
+        Returns:
+            ColorTransform, or None if no usable profile was found
+        """
+        try:
+            connection = None if icc_profile else get_x_connection()
+            profile = load_display_profile(icc_profile, connection)
+            if profile is None:
+                print("Warning: No display ICC profile found, showing raw values")
+                return None
+            return ColorTransform(profile, color_space)
+        except Exception as e:
+            print(f"Warning: Cannot build color transform: {e}")
+            return None
 
     def _check_shortcut_release(self):
         """Monitor keyboard state and copy when Super+Shift+C is released."""
-        if not self.x_display:
+        if not self.x_connection:
             return
 
         try:
             # Query current keyboard state from X11
-            keyboard_state = self.x_display.query_keymap()
-
-            # Convert byte array to set of pressed keycodes
-            pressed_keys = set()
-            for byte_idx, byte_val in enumerate(keyboard_state):
-                for bit_idx in range(8):
-                    if byte_val & (1 << bit_idx):
-                        keycode = byte_idx * 8 + bit_idx
-                        pressed_keys.add(keycode)
-
-            # Get keycodes for Super, Shift, and C keys
-            super_l = self.x_display.keysym_to_keycode(0xffeb)  # Super_L
-            super_r = self.x_display.keysym_to_keycode(0xffec)  # Super_R
-            shift_l = self.x_display.keysym_to_keycode(0xffe1)  # Shift_L
-            shift_r = self.x_display.keysym_to_keycode(0xffe2)  # Shift_R
-            c_key = self.x_display.keysym_to_keycode(0x63)      # c
+            with self.x_connection.lock:
+                keyboard_state = self.x_connection.display.query_keymap()
+
+            def any_pressed(keycodes):
+                # Test only the bits of the keys we care about
+                return any(
+                    keycode and keyboard_state[keycode // 8] & (1 << (keycode % 8))
+                    for keycode in keycodes
+                )
 
             # Check if shortcut keys are currently pressed
-            super_pressed = super_l in pressed_keys or super_r in pressed_keys
-            shift_pressed = shift_l in pressed_keys or shift_r in pressed_keys
-            c_pressed = c_key in pressed_keys
+            super_pressed = any_pressed(self.super_keycodes)
+            shift_pressed = any_pressed(self.shift_keycodes)
+            c_pressed = any_pressed(self.c_keycodes)
 
             # All three keys must be pressed for combo to be active
             shortcut_combo_pressed = super_pressed and shift_pressed and c_pressed
@@ -169,6 +462,7 @@ class PickerOverlay(QWidget):
 
         except Exception as e:
             # If monitoring fails, disable it
+            METRICS.inc("x_errors")
             print(f"Error monitoring keyboard: {e}")
             self.monitoring_release = False
             if hasattr(self, 'key_monitor_timer'):
@@ -181,14 +475,58 @@ class PickerOverlay(QWidget):
         Args:
             event: Key release event
         """
+        self._handle_key_release(event.key())
+
+    def _handle_key_release(self, key: Optional[Qt.Key]):
+        """
+        React to a released key (from Qt or the input grab).
+
+        Args:
+            key: Qt key, or None for keys without special meaning
+        """
         # Escape always closes without copying
-        if event.key() == Qt.Key.Key_Escape:
+        if key == Qt.Key.Key_Escape:
             self._close_picker()
+        # V cycles color vision simulations
+        elif key == Qt.Key.Key_V:
+            self._set_vision_mode(next_cvd_mode(self.vision_mode))
+        # H cycles the contrast heatmap, L locks its reference color
+        elif key == Qt.Key.Key_H:
+            self._cycle_contrast_mode()
+        elif key == Qt.Key.Key_L:
+            self._toggle_contrast_lock()
+        # Session mode: Enter copies the collected palette
+        elif self.session:
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self._copy_session_and_close()
         # If not monitoring keyboard state, any key release copies
-        elif not self.monitoring_release:
+        # (gradient mode only copies on drag)
+        elif not self.monitoring_release and not self.gradient:
             self._copy_and_close()
         # Otherwise, let the keyboard monitor handle shortcut release
 
+    def mousePressEvent(self, event):
+        """
+        Handle mouse press to start a gradient line.
+
+        Args:
+            event: Mouse press event
+        """
+        global_pos = self.mapToGlobal(event.pos())
+        self.cursor_x = global_pos.x()
+        self.cursor_y = global_pos.y()
+        self._handle_button_press(event.button())
+
+    def _handle_button_press(self, button: Qt.MouseButton):
+        """
+        React to a pressed mouse button (from Qt or the input grab).
+
+        Args:
+            button: Pressed Qt mouse button
+        """
+        if self.gradient and button == Qt.MouseButton.LeftButton:
+            self.drag_start = (self.cursor_x, self.cursor_y)
+
     def mouseReleaseEvent(self, event):
         """
         Handle mouse click to copy color.
@@ -196,70 +534,188 @@ class PickerOverlay(QWidget):
         Args:
             event: Mouse release event
         """
-        if event.button() == Qt.MouseButton.LeftButton:
-            self._copy_and_close()
-        elif event.button() == Qt.MouseButton.RightButton:
+        self._handle_button_release(event.button())
+
+    def _handle_button_release(self, button: Qt.MouseButton):
+        """
+        React to a released mouse button (from Qt or the input grab).
+
+        Args:
+            button: Released Qt mouse button
+        """
+        if button == Qt.MouseButton.LeftButton:
+            # Gradient mode: a drag copies the gradient along the line
+            if self.drag_start:
+                start, self.drag_start = self.drag_start, None
+                end = (self.cursor_x, self.cursor_y)
+                if max(abs(end[0] - start[0]), abs(end[1] - start[1])) >= GRADIENT_MIN_DRAG:
+                    # Remove our own drawing from screen before the capture
+                    self.update_timer.stop()
+                    self.magnifier.hide()
+                    self.repaint()
+                    QTimer.singleShot(GRADIENT_CAPTURE_DELAY_MS,
+                                      lambda: self._copy_gradient_and_close(start, end))
+                    return
+                self.update()
+
+            if self.session:
+                self._add_session_color()
+            else:
+                self._copy_and_close()
+        elif button == Qt.MouseButton.RightButton:
             # Right click: close without copying
             self._close_picker()
 
     def paintEvent(self, event):
-        """Paint the overlay (transparent)."""
+        """Paint the overlay (transparent, except for a gradient drag line)."""
         painter = QPainter(self)
         # Overlay is fully transparent - magnifier is a separate widget
 
+        if self.drag_start:
+            painter.setPen(QPen(THEME_BLUE_SOLID, 1))
+            start = self.mapFromGlobal(QPoint(*self.drag_start))
+            end = self.mapFromGlobal(QPoint(self.cursor_x, self.cursor_y))
+            painter.drawLine(start, end)
+
+    def _add_session_color(self):
+        """Append current color to the session palette."""
+        self.session_colors.append(
+            (self.current_hex, self.current_r, self.current_g, self.current_b)
+        )
+        self.magnifier.set_palette([(r, g, b) for _, r, g, b in self.session_colors])
+
+    def _copy_session_and_close(self):
+        """Copy the session palette to clipboard and close overlay."""
+        # Enter without any clicks copies the color under the cursor
+        if not self.session_colors:
+            self._add_session_color()
+
+        hex_codes = [hex_code for hex_code, _, _, _ in self.session_colors]
+        text = format_color_list(hex_codes, self.output_format, self.color_space)
+
+        if copy_text_to_clipboard(text):
+            _, r, g, b = self.session_colors[-1]
+            count = len(hex_codes)
+            self._show_notification(
+                'Palette Copied',
+                f'{count} color{"s" if count != 1 else ""} ({self.output_format})',
+                (r, g, b)
+            )
+
+        self._close_picker()
+
+    def _copy_gradient_and_close(self, start: Tuple[int, int], end: Tuple[int, int]):
+        """
+        Sample the line from a single capture and copy it as a CSS gradient.
+
+        Args:
+            start: Line start in screen coordinates
+            end: Line end in screen coordinates
+        """
+        x0, y0 = start
+        x1, y1 = end
+
+        try:
+            # One capture of the bounding box (plus the averaging margin)
+            capture = get_screen_capture()
+            radius = self.gradient_kernel // 2
+            left = max(0, min(x0, x1) - radius)
+            top = max(0, min(y0, y1) - radius)
+            right = min(capture.screen_width, max(x0, x1) + radius + 1)
+            bottom = min(capture.screen_height, max(y0, y1) + radius + 1)
+            image = capture.capture_region(left, top, right - left, bottom - top)
+
+            if image:
+                pixels = np.asarray(image)
+                xs, ys = line_points(x0 - left, y0 - top, x1 - left, y1 - top)
+                xs = np.clip(xs, 0, pixels.shape[1] - 1)
+                ys = np.clip(ys, 0, pixels.shape[0] - 1)
+                samples = sample_line(pixels, xs, ys, self.gradient_kernel)
+
+                # Convert only the samples, not the whole bounding box
+                if self.color_transform:
+                    samples = self.color_transform.apply_array(samples)
+
+                stops = simplify_stops(samples, self.gradient_tolerance, self.color_space)
+                css = css_linear_gradient(samples, stops, css_angle(x0, y0, x1, y1),
+                                          self.color_space)
+
+                if copy_text_to_clipboard(css):
+                    r, g, b = (int(c) for c in samples[0])
+                    self._show_notification('Gradient Copied', f'{len(stops)} stops', (r, g, b))
+
+        except Exception as e:
+            print(f"Error sampling gradient: {e}")
+
+        self._close_picker()
+
     def _copy_and_close(self):
         """Copy current color to clipboard and close overlay."""
-        # Copy to clipboard
-        success = copy_text_to_clipboard(self.current_hex)
+        # Copy to clipboard (CSS color() for Display-P3, hex otherwise)
+        text = format_color(self.current_r, self.current_g, self.current_b, self.color_space)
+        success = copy_text_to_clipboard(text)
 
         if success:
-            # Show notification with color swatch using notify-send if available
-            try:
-                import subprocess
-                import tempfile
-                from PIL import Image
-
-                # Create a color swatch image (48x48 pixels)
-                swatch_size = 48
-                swatch = Image.new('RGB', (swatch_size, swatch_size),
-                                   (self.current_r, self.current_g, self.current_b))
-
-                # Save to temporary file
-                with tempfile.NamedTemporaryFile(mode='w+b', suffix='.png', delete=False) as tmp:
-                    swatch.save(tmp, 'PNG')
-                    icon_path = tmp.name
-
-                # Show notification with color swatch as icon
-                subprocess.Popen(
-                    [
-                        'notify-send',
-                        '-i', icon_path,
-                        '-t', '2000',
-                        'Color Copied',
-                        f'{self.current_hex}\nRGB({self.current_r}, {self.current_g}, {self.current_b})'
-                    ],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-
-                # Clean up temporary file after a short delay
-                # (notification system needs time to load the icon)
-                import threading
-                def cleanup_icon():
-                    import time
-                    import os
-                    time.sleep(3)  # Wait for notification to load icon
-                    try:
-                        os.unlink(icon_path)
-                    except Exception:
-                        pass
+            self._show_notification(
+                'Color Copied',
+                f'{text}\nRGB({self.current_r}, {self.current_g}, {self.current_b})',
+                (self.current_r, self.current_g, self.current_b)
+            )
 
-                threading.Thread(target=cleanup_icon, daemon=True).start()
+        self._close_picker()
 
-            except Exception:
-                pass  # Notification is optional
+    def _show_notification(self, title: str, body: str, rgb: Tuple[int, int, int]):
+        """
+        Show notification with color swatch using notify-send if available.
 
-        self._close_picker()
+        Args:
+            title: Notification title
+            body: Notification body text
+            rgb: Swatch color as (r, g, b)
+        """
+        try:
+            import subprocess
+            import tempfile
+            from PIL import Image
+
+            # Create a color swatch image (48x48 pixels)
+            swatch_size = 48
+            swatch = Image.new('RGB', (swatch_size, swatch_size), rgb)
+
+            # Save to temporary file
+            with tempfile.NamedTemporaryFile(mode='w+b', suffix='.png', delete=False) as tmp:
+                swatch.save(tmp, 'PNG')
+                icon_path = tmp.name
+
+            # Show notification with color swatch as icon
+            subprocess.Popen(
+                [
+                    'notify-send',
+                    '-i', icon_path,
+                    '-t', '2000',
+                    title,
+                    body
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+
+            # Clean up temporary file after a short delay
+            # (notification system needs time to load the icon)
+            import threading
+            def cleanup_icon():
+                import time
+                import os
+                time.sleep(3)  # Wait for notification to load icon
+                try:
+                    os.unlink(icon_path)
+                except Exception:
+                    pass
+
+            threading.Thread(target=cleanup_icon, daemon=True).start()
+
+        except Exception:
+            pass  # Notification is optional
 
     def _close_picker(self):
         """Close the picker overlay."""
@@ -268,12 +724,18 @@ class PickerOverlay(QWidget):
         if hasattr(self, 'key_monitor_timer'):
             self.key_monitor_timer.stop()
 
-        # Close X11 display connection
-        if self.x_display:
+        # Release input grab before the connection goes away
+        if self.input_grab:
+            self.grab_event_timer.stop()
+            self.grab_retry_timer.stop()
             try:
-                self.x_display.close()
+                self.input_grab.release()
             except Exception:
                 pass
+            self.input_grab = None
+
+        # Close the shared X11 connection (capture and keyboard monitoring)
+        close_x_connection()
 
         # Close magnifier
         self.magnifier.close()
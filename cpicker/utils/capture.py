@@ -1,20 +1,37 @@
 """Screen capture utilities using X11."""
 
+import time
 from typing import Optional
-from Xlib import X, display
+from Xlib import X
 from PIL import Image
 
+from .pixel_format import PixelFormat
+from .x_connection import XConnection, get_x_connection
+from .metrics import METRICS
+from .config import get_config
+
 
 class ScreenCapture:
     """Handle X11 screen capture operations."""
 
-    def __init__(self):
-        """Initialize X11 display connection."""
+    def __init__(self, connection: Optional[XConnection] = None):
+        """
+        Initialize screen capture on an X11 connection.
+
+        Args:
+            connection: X connection to use (default: shared connection)
+        """
         try:
-            self.display = display.Display()
-            self.root = self.display.screen().root
-            self.screen_width = self.root.get_geometry().width
-            self.screen_height = self.root.get_geometry().height
+            self.connection = connection or get_x_connection()
+            self.display = self.connection.display
+            self.root = self.connection.root
+            # Screen size from connection setup data (no round trip)
+            self.screen_width = self.connection.screen.width_in_pixels
+            self.screen_height = self.connection.screen.height_in_pixels
+            # Read visual masks and image byte order once
+            self.pixel_format = PixelFormat.from_display(self.display)
+            # Rows per GetImage request (0 = whole region in one request)
+            self.tile_rows = get_config()["performance"]["capture_tile_rows"]
         except Exception as e:
             raise RuntimeError(f"Failed to connect to X11 display: {e}")
 
@@ -38,27 +55,38 @@ class ScreenCapture:
             width = max(1, min(width, self.screen_width - x))
             height = max(1, min(height, self.screen_height - y))
 
-            # Get raw image data from X11
-            raw = self.root.get_image(x, y, width, height, X.ZPixmap, 0xffffffff)
+            start = time.perf_counter()
 
-            # Convert to PIL Image
-            # X11 get_image always returns 4 bytes per pixel (BGRX) regardless of depth
-            # Using "BGR" for depth==24 causes stride mismatch and RGB decomposition
-            if raw.depth == 24:
-                image = Image.frombytes("RGB", (width, height), raw.data, "raw", "BGRX")
-            else:  # depth == 32
-                image = Image.frombytes("RGB", (width, height), raw.data, "raw", "BGRX")
+            if self.tile_rows and height > self.tile_rows:
+                # Large regions in horizontal bands to bound each reply's size
+                image = Image.new("RGB", (width, height))
+                for top in range(0, height, self.tile_rows):
+                    rows = min(self.tile_rows, height - top)
+                    image.paste(self._get_image(x, y + top, width, rows), (0, top))
+            else:
+                image = self._get_image(x, y, width, height)
 
+            METRICS.observe("capture_latency_seconds", time.perf_counter() - start)
             return image
 
         except Exception as e:
+            METRICS.inc("x_errors")
             print(f"Failed to capture screen region: {e}")
             return None
 
+    def _get_image(self, x: int, y: int, width: int, height: int) -> Image.Image:
+        """Fetch one region from X11 and decode it (coordinates already clamped)."""
+        with self.connection.lock:
+            raw = self.root.get_image(x, y, width, height, X.ZPixmap, 0xffffffff)
+
+        # Convert to PIL Image using the root visual's pixel layout
+        return self.pixel_format.decode(raw.data, width, height)
+
     def close(self):
-        """Close X11 display connection."""
-        if hasattr(self, 'display'):
-            self.display.close()
+        """Release the capture; the X connection is closed by its owner."""
+        global _screen_capture
+        if _screen_capture is self:
+            _screen_capture = None
 
 
 # Global instance for reuse
@@ -68,7 +96,8 @@ _screen_capture = None
 def get_screen_capture() -> ScreenCapture:
     """Get or create the global ScreenCapture instance."""
     global _screen_capture
-    if _screen_capture is None:
+    # Recreate if the shared connection was closed underneath us
+    if _screen_capture is None or _screen_capture.connection.closed:
         _screen_capture = ScreenCapture()
     return _screen_capture
 
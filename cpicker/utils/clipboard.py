@@ -3,6 +3,8 @@
 import subprocess
 import shutil
 
+from .metrics import METRICS
+
 
 def copy_text_to_clipboard(text: str) -> bool:
     """
@@ -16,6 +18,7 @@ def copy_text_to_clipboard(text: str) -> bool:
     """
     # Check if xclip is available
     if not shutil.which('xclip'):
+        METRICS.inc("clipboard_failures")
         print("Error: xclip not found. Please install xclip: sudo apt install xclip")
         return False
 
@@ -28,12 +31,17 @@ def copy_text_to_clipboard(text: str) -> bool:
             stderr=subprocess.DEVNULL
         )
         process.communicate(input=text.encode('utf-8'), timeout=1)
-        return process.returncode == 0
+        if process.returncode != 0:
+            METRICS.inc("clipboard_failures")
+            return False
+        return True
 
     except subprocess.TimeoutExpired:
         process.kill()
+        METRICS.inc("clipboard_failures")
         print("Error: xclip timed out")
         return False
     except Exception as e:
+        METRICS.inc("clipboard_failures")
         print(f"Error copying to clipboard: {e}")
         return False
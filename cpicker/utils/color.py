@@ -1,6 +1,11 @@
 """Color conversion utilities for cPicker."""
 
-from typing import Tuple
+import json
+from typing import List, Tuple
+
+
+# Output formats supported for multi-pick sessions
+PALETTE_FORMATS = ("hex", "css", "json")
 
 
 def rgb_to_hex(r: int, g: int, b: int) -> str:
@@ -30,3 +35,50 @@ def hex_to_rgb(hex_code: str) -> Tuple[int, int, int]:
     """
     hex_code = hex_code.lstrip('#')
     return tuple(int(hex_code[i:i+2], 16) for i in (0, 2, 4))
+
+
+def format_color(r: int, g: int, b: int, color_space: str = "srgb") -> str:
+    """
+    Format a color for copying in its color space.
+
+    CSS reads hex codes as sRGB, so Display-P3 values are written as a
+    CSS color() instead.
+
+    Args:
+        r: Red component (0-255)
+        g: Green component (0-255)
+        b: Blue component (0-255)
+        color_space: "srgb" or "display-p3"
+
+    Returns:
+        Hex code (e.g., "#3A7FBD") or "color(display-p3 0.2275 0.498 0.7412)"
+    """
+    if color_space == "display-p3":
+        channels = " ".join(f"{c / 255:.4f}".rstrip("0").rstrip(".") for c in (r, g, b))
+        return f"color(display-p3 {channels})"
+    return rgb_to_hex(r, g, b)
+
+
+def format_color_list(hex_codes: List[str], fmt: str = "hex",
+                      color_space: str = "srgb") -> str:
+    """
+    Format a list of hex color codes for copying as a palette.
+
+    Args:
+        hex_codes: Hex color codes in pick order (e.g., ["#3A7FBD", "#FFFFFF"])
+        fmt: Output format, one of PALETTE_FORMATS
+        color_space: Space of the colors; Display-P3 colors are written as
+            color(display-p3 ...) in every format
+
+    Returns:
+        Formatted palette string
+    """
+    colors = [format_color(*hex_to_rgb(code), color_space) for code in hex_codes]
+    if fmt == "hex":
+        return "\n".join(colors)
+    if fmt == "css":
+        lines = [f"  --color-{i}: {color};" for i, color in enumerate(colors, start=1)]
+        return ":root {\n" + "\n".join(lines) + "\n}"
+    if fmt == "json":
+        return json.dumps(colors, indent=2)
+    raise ValueError(f"Unknown palette format: {fmt}")
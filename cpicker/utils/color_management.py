@@ -0,0 +1,238 @@
+"""ICC-aware conversion of picked colors via a precomputed 3D LUT."""
+
+import io
+import hashlib
+import struct
+from pathlib import Path
+from typing import Optional, Tuple
+import numpy as np
+from Xlib import X
+from PIL import Image, ImageCms
+
+from .x_connection import XConnection
+from .config import get_config
+
+
+# Target color spaces for converted output
+COLOR_SPACES = ("srgb", "display-p3")
+COLOR_SPACE_LABELS = {"srgb": "sRGB", "display-p3": "P3"}
+
+# LUT grid spacing in 8-bit units (config: performance.color_lut_step); the
+# step divides 255, so every grid node is an exact 8-bit input (default 5 =
+# 52 nodes per axis)
+LUT_STEP = get_config()["performance"]["color_lut_step"]
+LUT_NODES = 255 // LUT_STEP + 1
+
+# Built LUTs are stored here keyed by profile hash, so launches skip the CMS
+LUT_CACHE_DIR = Path.home() / ".cache" / "cpicker"
+
+# Bumped when the built LUTs change for the same inputs (2: fixed P3 header)
+LUT_CACHE_VERSION = 2
+
+
+def load_display_profile(path: Optional[str] = None,
+                         connection: Optional[XConnection] = None) -> Optional[bytes]:
+    """
+    Load the display ICC profile from a file or the X root window.
+
+    Args:
+        path: ICC profile file path (takes precedence if given)
+        connection: X connection to read the _ICC_PROFILE property from
+
+    Returns:
+        Raw ICC profile bytes, or None if no profile is available
+    """
+    if path:
+        try:
+            return Path(path).expanduser().read_bytes()
+        except OSError as e:
+            print(f"Error reading ICC profile {path}: {e}")
+            return None
+
+    if connection is None:
+        return None
+
+    try:
+        atom = connection.atom("_ICC_PROFILE", only_if_exists=True)
+        if atom == X.NONE:
+            return None
+        with connection.lock:
+            prop = connection.root.get_full_property(atom, X.AnyPropertyType)
+        if prop is None or not prop.value:
+            return None
+        return bytes(prop.value)
+    except Exception as e:
+        print(f"Error reading _ICC_PROFILE: {e}")
+        return None
+
+
+def _s15fixed16(value: float) -> bytes:
+    """Encode a number as ICC s15Fixed16Number."""
+    return struct.pack(">i", int(round(value * 65536)))
+
+
+def _xyz_tag(x: float, y: float, z: float) -> bytes:
+    """Build an ICC XYZType tag."""
+    return b"XYZ " + b"\0" * 4 + _s15fixed16(x) + _s15fixed16(y) + _s15fixed16(z)
+
+
+def _display_p3_profile() -> ImageCms.ImageCmsProfile:
+    """
+    Build a Display-P3 ICC profile in memory.
+
+    Pillow can only create sRGB, LAB and XYZ profiles, so this writes a
+    minimal v2 matrix/TRC profile: P3 primaries (Bradford-adapted to D50)
+    with the sRGB transfer curve.
+    """
+    # sRGB transfer curve sampled into a 1024-entry table
+    x = np.linspace(0.0, 1.0, 1024)
+    curve = np.where(x <= 0.04045, x / 12.92, ((x + 0.055) / 1.055) ** 2.4)
+    trc = b"curv" + b"\0" * 4 + struct.pack(">I", len(curve))
+    trc += np.round(curve * 65535).astype(">u2").tobytes()
+
+    desc_text = b"Display P3\0"
+    desc = (b"desc" + b"\0" * 4 + struct.pack(">I", len(desc_text)) + desc_text
+            + b"\0" * 8 + b"\0" * 3 + b"\0" * 67)
+
+    tags = [
+        (b"desc", desc),
+        (b"wtpt", _xyz_tag(0.9642, 1.0, 0.8249)),
+        (b"rXYZ", _xyz_tag(0.515102, 0.241182, -0.001050)),
+        (b"gXYZ", _xyz_tag(0.291965, 0.692236, 0.041882)),
+        (b"bXYZ", _xyz_tag(0.157153, 0.066581, 0.784378)),
+        (b"rTRC", trc),
+        (b"gTRC", trc),
+        (b"bTRC", trc),
+        (b"cprt", b"text" + b"\0" * 4 + b"No copyright\0"),
+    ]
+
+    # Lay out tag data after the header and tag table, 4-byte aligned
+    offset = 128 + 4 + 12 * len(tags)
+    table = struct.pack(">I", len(tags))
+    data = b""
+    for signature, body in tags:
+        body += b"\0" * (-len(body) % 4)
+        table += signature + struct.pack(">II", offset + len(data), len(body))
+        data += body
+
+    size = offset + len(data)
+    header = (struct.pack(">I", size) + b"\0" * 4 + struct.pack(">I", 0x02100000)
+              + b"mntrRGB XYZ " + b"\0" * 12 + b"acsp" + b"\0" * 24
+              + b"\0" * 4  # Rendering intent: perceptual
+              + _s15fixed16(0.9642) + _s15fixed16(1.0) + _s15fixed16(0.8249))
+    header += b"\0" * (128 - len(header))
+
+    return ImageCms.ImageCmsProfile(io.BytesIO(header + table + data))
+
+
+class ColorTransform:
+    """
+    Display profile to sRGB/Display-P3 conversion.
+
+    The CMS transform runs once over a LUT_NODES³ grid; afterwards every
+    conversion is a trilinear lookup into that table.
+    """
+
+    def __init__(self, profile: bytes, target: str = "srgb"):
+        """
+        Initialize color transform.
+
+        Args:
+            profile: Raw display ICC profile bytes
+            target: Output color space, one of COLOR_SPACES
+        """
+        if target not in COLOR_SPACES:
+            raise ValueError(f"Unknown color space: {target}")
+
+        self.target = target
+        self.label = COLOR_SPACE_LABELS[target]
+        self.lut = self._load_lut(profile, target)
+
+    def apply(self, r: int, g: int, b: int) -> Tuple[int, int, int]:
+        """
+        Convert a single color.
+
+        Args:
+            r: Red component (0-255)
+            g: Green component (0-255)
+            b: Blue component (0-255)
+
+        Returns:
+            Converted (r, g, b) tuple
+        """
+        out = self.apply_array(np.array([[r, g, b]], dtype=np.uint8))[0]
+        return int(out[0]), int(out[1]), int(out[2])
+
+    def apply_array(self, rgb: np.ndarray) -> np.ndarray:
+        """
+        Convert an array of 8-bit colors with trilinear interpolation.
+
+        Args:
+            rgb: uint8 array of shape (..., 3)
+
+        Returns:
+            uint8 array of the same shape
+        """
+        pos = rgb.astype(np.float32) / LUT_STEP
+        index = np.minimum(pos.astype(np.intp), LUT_NODES - 2)
+        frac = pos - index
+
+        r0, g0, b0 = index[..., 0], index[..., 1], index[..., 2]
+        fr, fg, fb = frac[..., 0:1], frac[..., 1:2], frac[..., 2:3]
+        lut = self.lut
+
+        c00 = lut[r0, g0, b0] * (1 - fr) + lut[r0 + 1, g0, b0] * fr
+        c01 = lut[r0, g0, b0 + 1] * (1 - fr) + lut[r0 + 1, g0, b0 + 1] * fr
+        c10 = lut[r0, g0 + 1, b0] * (1 - fr) + lut[r0 + 1, g0 + 1, b0] * fr
+        c11 = lut[r0, g0 + 1, b0 + 1] * (1 - fr) + lut[r0 + 1, g0 + 1, b0 + 1] * fr
+        c0 = c00 * (1 - fg) + c10 * fg
+        c1 = c01 * (1 - fg) + c11 * fg
+        out = c0 * (1 - fb) + c1 * fb
+
+        return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+    def _load_lut(self, profile: bytes, target: str) -> np.ndarray:
+        """Load the LUT from the disk cache, building it on a miss."""
+        key = hashlib.sha1(profile).hexdigest()[:16]
+        cache_path = LUT_CACHE_DIR / f"lut-v{LUT_CACHE_VERSION}-{key}-{target}-{LUT_NODES}.npy"
+
+        try:
+            lut = np.load(cache_path)
+            if lut.shape == (LUT_NODES, LUT_NODES, LUT_NODES, 3):
+                return lut
+        except (OSError, ValueError):
+            pass
+
+        lut = self._build_lut(profile, target)
+
+        try:
+            LUT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            np.save(cache_path, lut)
+        except OSError:
+            pass  # Cache is optional
+
+        return lut
+
+    @staticmethod
+    def _build_lut(profile: bytes, target: str) -> np.ndarray:
+        """Run the CMS transform once over every grid node."""
+        source = ImageCms.ImageCmsProfile(io.BytesIO(profile))
+        if target == "srgb":
+            destination = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB"))
+        else:
+            destination = _display_p3_profile()
+
+        transform = ImageCms.buildTransform(
+            source, destination, "RGB", "RGB",
+            renderingIntent=ImageCms.Intent.RELATIVE_COLORIMETRIC
+        )
+
+        # Grid as a single-row image, red varying slowest
+        axis = np.arange(LUT_NODES, dtype=np.uint8) * LUT_STEP
+        grid = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1)
+        grid_image = Image.fromarray(grid.reshape(1, -1, 3), "RGB")
+
+        converted = ImageCms.applyTransform(grid_image, transform)
+        return np.asarray(converted, dtype=np.float32).reshape(
+            LUT_NODES, LUT_NODES, LUT_NODES, 3
+        )
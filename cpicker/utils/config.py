@@ -0,0 +1,230 @@
+"""User configuration for cPicker (TOML), validated once and cached."""
+
+import os
+import re
+import math
+import hashlib
+import marshal
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+
+CONFIG_PATH = Path.home() / ".config" / "cpicker" / "config.toml"
+
+# Validated configs are snapshotted here (marshal) keyed by the config file's
+# mtime and size and the schema, so unchanged configs are never parsed or
+# validated again
+SNAPSHOT_PATH = Path.home() / ".cache" / "cpicker" / "config.snapshot"
+SNAPSHOT_VERSION = 1
+
+_COLOR_RE = re.compile(r"^#([0-9a-fA-F]{6}|[0-9a-fA-F]{8})$")
+
+# section -> key -> (kind, default, constraint)
+# kind: "int", "odd_int" (centered windows), "float", "str" or "color"
+# constraint: (min, max) tuple for numbers, list of allowed values otherwise
+SCHEMA: Dict[str, Dict[str, tuple]] = {
+    "theme": {
+        "highlight": ("color", "#0096FFC8", None),
+        "highlight_solid": ("color", "#0096FFFF", None),
+        "background": ("color", "#282828F0", None),
+        "text": ("color", "#FFFFFFFF", None),
+        "grid": ("color", "#FFFFFF3C", None),
+        "guide": ("color", "#FFFFFF32", None),
+        "heat_pass": ("color", "#00C85050", None),
+        "heat_fail": ("color", "#FF282878", None),
+        "font_family": ("str", "monospace", None),
+        "hex_font_size": ("int", 24, (6, 72)),
+        "rgb_font_size": ("int", 12, (6, 48)),
+        "label_font_size": ("int", 9, (6, 48)),
+    },
+    "magnifier": {
+        "source_size": ("odd_int", 21, (5, 101)),
+        "zoom": ("int", 10, (2, 40)),
+        "offset": ("int", 30, (0, 500)),
+        "palette_swatch_size": ("int", 20, (8, 64)),
+    },
+    "sampling": {
+        "vision_mode": ("str", "", ["", "protanopia", "deuteranopia", "tritanopia", "achromatopsia"]),
+        "gradient_kernel": ("odd_int", 1, (1, 15)),
+        "gradient_tolerance": ("float", 2.0, (0.0, math.inf)),
+    },
+    "output": {
+        "palette_format": ("str", "hex", ["hex", "css", "json"]),
+        "color_space": ("str", "", ["", "srgb", "display-p3"]),
+        "icc_profile": ("str", "", None),
+    },
+    "performance": {
+        "input_backend": ("str", "overlay", ["overlay", "grab"]),
+        "refresh_ms": ("int", 30, (5, 1000)),
+        "key_poll_ms": ("int", 50, (10, 1000)),
+        "capture_tile_rows": ("int", 0, (0, 100000)),
+        "color_lut_step": ("int", 5, [3, 5, 15, 17]),
+    },
+}
+
+
+# Snapshots from a release with different keys or defaults are rebuilt
+SCHEMA_HASH = hashlib.sha1(repr(SCHEMA).encode()).hexdigest()
+
+
+class ConfigError(ValueError):
+    """Raised when the config file is invalid."""
+
+
+def default_config() -> Dict[str, Dict[str, Any]]:
+    """Get the built-in configuration."""
+    return {
+        section: {key: spec[1] for key, spec in fields.items()}
+        for section, fields in SCHEMA.items()
+    }
+
+
+def parse_color(value: str) -> tuple:
+    """
+    Convert a hex color to an RGBA tuple.
+
+    Args:
+        value: "#RRGGBB" or "#RRGGBBAA"
+
+    Returns:
+        Tuple of (r, g, b, a) values (0-255)
+    """
+    value = value.lstrip('#')
+    if len(value) == 6:
+        value += "FF"
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4, 6))
+
+
+def _validate_value(name: str, value: Any, kind: str, constraint) -> Any:
+    """Check one value against its schema entry and normalize it."""
+    if kind in ("int", "odd_int"):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ConfigError(f"{name}: expected an integer, got {value!r}")
+        if kind == "odd_int" and value % 2 == 0:
+            raise ConfigError(f"{name}: must be odd so there is a center pixel, got {value}")
+    elif kind == "float":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ConfigError(f"{name}: expected a number, got {value!r}")
+        value = float(value)
+        if not math.isfinite(value):
+            raise ConfigError(f"{name}: expected a finite number, got {value}")
+    elif kind in ("str", "color"):
+        if not isinstance(value, str):
+            raise ConfigError(f"{name}: expected a string, got {value!r}")
+        if kind == "color" and not _COLOR_RE.match(value):
+            raise ConfigError(f"{name}: expected #RRGGBB or #RRGGBBAA, got {value!r}")
+
+    if isinstance(constraint, tuple):
+        low, high = constraint
+        if not low <= value <= high:
+            if high == math.inf:
+                raise ConfigError(f"{name}: must be at least {low}, got {value}")
+            raise ConfigError(f"{name}: must be between {low} and {high}, got {value}")
+    elif isinstance(constraint, list) and value not in constraint:
+        choices = ", ".join(repr(c) for c in constraint)
+        raise ConfigError(f"{name}: must be one of {choices}, got {value!r}")
+
+    return value
+
+
+def validate_config(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Validate a parsed config and merge it over the defaults.
+
+    Args:
+        data: Parsed TOML document
+
+    Returns:
+        Complete configuration
+
+    Raises:
+        ConfigError: On unknown keys, wrong types or out-of-range values
+    """
+    config = default_config()
+
+    for section, values in data.items():
+        fields = SCHEMA.get(section)
+        if fields is None:
+            raise ConfigError(f"Unknown section [{section}]")
+        if not isinstance(values, dict):
+            raise ConfigError(f"[{section}] must be a table")
+
+        for key, value in values.items():
+            spec = fields.get(key)
+            if spec is None:
+                raise ConfigError(f"Unknown key {section}.{key}")
+            kind, _, constraint = spec
+            config[section][key] = _validate_value(f"{section}.{key}", value, kind, constraint)
+
+    return config
+
+
+def _read_snapshot(stat: os.stat_result) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Load the cached config if it was built from the current file."""
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            version, schema_hash, path, mtime_ns, size, config = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (version, schema_hash, path, mtime_ns, size) != (
+            SNAPSHOT_VERSION, SCHEMA_HASH, str(CONFIG_PATH), stat.st_mtime_ns, stat.st_size):
+        return None
+    return config
+
+
+def _write_snapshot(stat: os.stat_result, config: Dict[str, Dict[str, Any]]):
+    """Cache a validated config keyed by the file's mtime and size and the schema."""
+    try:
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = SNAPSHOT_PATH.with_suffix(".tmp")
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((SNAPSHOT_VERSION, SCHEMA_HASH, str(CONFIG_PATH),
+                          stat.st_mtime_ns, stat.st_size, config), f)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError:
+        pass  # Snapshot is optional
+
+
+def load_config() -> Dict[str, Dict[str, Any]]:
+    """
+    Load the user config, using the cached snapshot when it is current.
+
+    Returns:
+        Complete configuration (defaults if the file is missing or invalid)
+    """
+    try:
+        stat = CONFIG_PATH.stat()
+    except OSError:
+        return default_config()
+
+    config = _read_snapshot(stat)
+    if config is not None:
+        return config
+
+    try:
+        with open(CONFIG_PATH, 'rb') as f:
+            config = validate_config(tomllib.load(f))
+    except (OSError, tomllib.TOMLDecodeError, ConfigError) as e:
+        print(f"Error in {CONFIG_PATH}: {e} (using defaults)")
+        return default_config()
+
+    _write_snapshot(stat, config)
+    return config
+
+
+# Loaded once per process
+_config = None
+
+
+def get_config() -> Dict[str, Dict[str, Any]]:
+    """Get or load the global configuration."""
+    global _config
+    if _config is None:
+        _config = load_config()
+    return _config
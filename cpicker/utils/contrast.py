@@ -0,0 +1,127 @@
+"""WCAG 2.x and APCA contrast between a reference color and a whole buffer."""
+
+from typing import Optional, Tuple
+import numpy as np
+
+from .vision import SRGB_TO_LINEAR
+
+
+# Heatmap modes in toggle order
+CONTRAST_MODES = ("wcag", "apca")
+
+# Pass thresholds: WCAG AA for normal text, APCA Lc for body text
+WCAG_MIN_RATIO = 4.5
+APCA_MIN_LC = 60.0
+
+# Per-channel luminance contributions indexed by 8-bit code, so relative
+# luminance of a buffer is three lookups and two additions
+_WCAG_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)[:, None] * SRGB_TO_LINEAR
+_APCA_LUMA = (np.array([0.2126729, 0.7151522, 0.0721750], dtype=np.float32)[:, None]
+              * (np.arange(256, dtype=np.float32) / 255.0) ** 2.4)
+
+
+def _luminance(rgb: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Look up luminance of uint8 colors of shape (..., 3)."""
+    return table[0, rgb[..., 0]] + table[1, rgb[..., 1]] + table[2, rgb[..., 2]]
+
+
+def wcag_contrast(rgb: np.ndarray, reference: Tuple[int, int, int]) -> np.ndarray:
+    """
+    WCAG 2.x contrast ratio between a reference color and every pixel.
+
+    Args:
+        rgb: uint8 array of shape (..., 3)
+        reference: Reference (r, g, b) color
+
+    Returns:
+        Contrast ratios (1 to 21) with the shape of rgb[..., 0]
+    """
+    y = _luminance(rgb, _WCAG_LUMA)
+    y_ref = _luminance(np.array(reference, dtype=np.uint8), _WCAG_LUMA)
+    lighter = np.maximum(y, y_ref)
+    darker = np.minimum(y, y_ref)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def apca_contrast(rgb: np.ndarray, reference: Tuple[int, int, int]) -> np.ndarray:
+    """
+    APCA (0.0.98G) lightness contrast of reference-colored text on every pixel.
+
+    Args:
+        rgb: uint8 array of shape (..., 3), used as background
+        reference: Text (r, g, b) color
+
+    Returns:
+        Lc values (about -108 to 106) with the shape of rgb[..., 0]
+    """
+    def soft_clamp(y):
+        return np.where(y < 0.022, y + np.abs(0.022 - y) ** 1.414, y)
+
+    y_bg = soft_clamp(_luminance(rgb, _APCA_LUMA))
+    y_txt = soft_clamp(_luminance(np.array(reference, dtype=np.uint8), _APCA_LUMA))
+
+    # Dark text on light background vs. light text on dark background
+    normal = (y_bg ** 0.56 - y_txt ** 0.57) * 1.14
+    reverse = (y_bg ** 0.65 - y_txt ** 0.62) * 1.14
+    sapc = np.where(y_bg > y_txt, normal, reverse)
+
+    lc = np.where(sapc > 0, sapc - 0.027, sapc + 0.027)
+    lc = np.where(np.abs(sapc) < 0.1, 0.0, lc)
+    lc = np.where(np.abs(y_bg - y_txt) < 0.0005, 0.0, lc)
+    return lc * 100.0
+
+
+def contrast_heatmap(rgb: np.ndarray, reference: Tuple[int, int, int],
+                     mode: str) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    Pass/fail status of every pixel against a reference color.
+
+    Pixels with exactly the reference color are ignored, so the worst value
+    is not always the reference against itself.
+
+    Args:
+        rgb: uint8 array of shape (height, width, 3)
+        reference: Reference (r, g, b) color
+        mode: One of CONTRAST_MODES
+
+    Returns:
+        Tuple of (status, worst): status is an int8 (height, width) array
+        with 1 = pass, 0 = fail, -1 = ignored; worst is the lowest ratio
+        (WCAG) or |Lc| (APCA) among non-ignored pixels, or None
+    """
+    if mode == "wcag":
+        values = wcag_contrast(rgb, reference)
+        threshold = WCAG_MIN_RATIO
+    elif mode == "apca":
+        values = np.abs(apca_contrast(rgb, reference))
+        threshold = APCA_MIN_LC
+    else:
+        raise ValueError(f"Unknown contrast mode: {mode}")
+
+    ignored = np.all(rgb == np.array(reference, dtype=np.uint8), axis=-1)
+    status = np.where(values >= threshold, 1, 0).astype(np.int8)
+    status[ignored] = -1
+
+    considered = values[~ignored]
+    worst = float(considered.min()) if considered.size else None
+    return status, worst
+
+
+def format_contrast(worst: Optional[float], mode: str) -> str:
+    """
+    Format the worst contrast value for the info panel.
+
+    Args:
+        worst: Lowest ratio or |Lc|, or None if nothing to compare
+        mode: One of CONTRAST_MODES
+
+    Returns:
+        Short summary (e.g., "3.21:1 ✗" or "Lc 72 ✓")
+    """
+    if worst is None:
+        return "—"
+    if mode == "wcag":
+        mark = "✓" if worst >= WCAG_MIN_RATIO else "✗"
+        return f"{worst:.2f}:1 {mark}"
+    mark = "✓" if worst >= APCA_MIN_LC else "✗"
+    return f"Lc {worst:.0f} {mark}"
@@ -0,0 +1,195 @@
+"""Line sampling and gradient stop simplification for cPicker."""
+
+import math
+from typing import List, Tuple
+import numpy as np
+
+from .color import format_color
+from .vision import SRGB_TO_LINEAR
+
+
+# Default maximum ΔE (CIE76) between the samples and the simplified gradient
+DEFAULT_TOLERANCE = 2.0
+
+# sRGB (D65) linear RGB -> XYZ
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+], dtype=np.float32)
+
+# Display-P3 (D65) linear RGB -> XYZ; P3 uses the sRGB transfer curve
+_P3_TO_XYZ = np.array([
+    [0.4865709, 0.2656677, 0.1982173],
+    [0.2289746, 0.6917385, 0.0792869],
+    [0.0000000, 0.0451134, 1.0439444],
+], dtype=np.float32)
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+
+def line_points(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get every pixel on a line, one per step along the major axis.
+
+    Equivalent to Bresenham's algorithm (up to tie-breaking), but computed
+    for all points at once.
+
+    Args:
+        x0: Start X coordinate
+        y0: Start Y coordinate
+        x1: End X coordinate
+        y1: End Y coordinate
+
+    Returns:
+        Tuple of (xs, ys) integer arrays, start to end inclusive
+    """
+    steps = max(abs(x1 - x0), abs(y1 - y0))
+    t = np.linspace(0.0, 1.0, steps + 1)
+    xs = np.rint(x0 + t * (x1 - x0)).astype(np.intp)
+    ys = np.rint(y0 + t * (y1 - y0)).astype(np.intp)
+    return xs, ys
+
+
+def sample_line(pixels: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                kernel: int = 1) -> np.ndarray:
+    """
+    Sample colors along a line from a single captured buffer.
+
+    Args:
+        pixels: uint8 array (height, width, 3) covering the line
+        xs: X coordinates relative to the buffer
+        ys: Y coordinates relative to the buffer
+        kernel: Side of the square averaging window (1 = exact pixels)
+
+    Returns:
+        uint8 array (len(xs), 3) of sampled colors
+    """
+    if kernel <= 1:
+        return pixels[ys, xs]
+
+    # Gather the kernel window around every sample at once (clamped at edges)
+    radius = kernel // 2
+    height, width = pixels.shape[:2]
+    offsets = np.arange(-radius, kernel - radius)
+    window_ys = np.clip(ys[:, None, None] + offsets[None, :, None], 0, height - 1)
+    window_xs = np.clip(xs[:, None, None] + offsets[None, None, :], 0, width - 1)
+    windows = pixels[window_ys, window_xs].astype(np.float32)
+    return np.rint(windows.mean(axis=(1, 2))).astype(np.uint8)
+
+
+def rgb_to_lab(rgb: np.ndarray, color_space: str = "srgb") -> np.ndarray:
+    """
+    Convert sRGB or Display-P3 colors to CIE L*a*b* (D65).
+
+    Args:
+        rgb: Array (..., 3) of encoded values; uint8, or float in 0-255
+        color_space: "srgb" or "display-p3"
+
+    Returns:
+        Float array (..., 3) of L*, a*, b*
+    """
+    if rgb.dtype == np.uint8:
+        linear = SRGB_TO_LINEAR[rgb]
+    else:
+        v = np.clip(rgb, 0, 255) / 255.0
+        linear = np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+    to_xyz = _P3_TO_XYZ if color_space == "display-p3" else _RGB_TO_XYZ
+    xyz = linear @ to_xyz.T / _D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack([
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ], axis=-1)
+
+
+def simplify_stops(samples: np.ndarray, tolerance: float = DEFAULT_TOLERANCE,
+                   color_space: str = "srgb") -> List[int]:
+    """
+    Reduce samples to the fewest stops that reproduce them within a ΔE.
+
+    Ramer-Douglas-Peucker over the sample index: a segment is kept if
+    interpolation of the encoded values between its end stops (what CSS
+    does for hex stops, and for `in display-p3`) stays within `tolerance`
+    ΔE76 of every sample; otherwise it is split at the worst sample.
+
+    Args:
+        samples: uint8 array (n, 3) of colors along the line
+        tolerance: Maximum allowed ΔE76
+        color_space: Space of the samples, "srgb" or "display-p3"
+
+    Returns:
+        Sorted sample indices to keep as stops (always includes both ends)
+    """
+    count = len(samples)
+    if count <= 2:
+        return list(range(count))
+
+    lab = rgb_to_lab(samples, color_space)
+    colors = samples.astype(np.float32)
+    keep = {0, count - 1}
+    segments = [(0, count - 1)]
+
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2:
+            continue
+
+        t = (np.arange(start + 1, end) - start) / (end - start)
+        interpolated = colors[start] + t[:, None] * (colors[end] - colors[start])
+        delta_e = np.linalg.norm(rgb_to_lab(interpolated, color_space) - lab[start + 1:end], axis=1)
+
+        worst = int(np.argmax(delta_e))
+        if delta_e[worst] > tolerance:
+            split = start + 1 + worst
+            keep.add(split)
+            segments.append((start, split))
+            segments.append((split, end))
+
+    return sorted(keep)
+
+
+def css_angle(x0: int, y0: int, x1: int, y1: int) -> int:
+    """
+    Get the CSS gradient angle for a line in screen coordinates.
+
+    Args:
+        x0: Start X coordinate
+        y0: Start Y coordinate
+        x1: End X coordinate
+        y1: End Y coordinate
+
+    Returns:
+        Angle in degrees (0 = to top, 90 = to right)
+    """
+    return round(math.degrees(math.atan2(x1 - x0, y0 - y1))) % 360
+
+
+def css_linear_gradient(samples: np.ndarray, stops: List[int], angle: int,
+                        color_space: str = "srgb") -> str:
+    """
+    Format gradient stops as a CSS linear-gradient().
+
+    Hex stops are read as sRGB by CSS, so Display-P3 samples are emitted
+    as color(display-p3 ...) stops interpolated `in display-p3`.
+
+    Args:
+        samples: uint8 array (n, 3) of colors along the line
+        stops: Sample indices to emit as color stops
+        angle: Gradient angle in degrees
+        color_space: Space of the samples, "srgb" or "display-p3"
+
+    Returns:
+        CSS value, e.g. "linear-gradient(90deg, #FF0000 0%, #0000FF 100%)"
+    """
+    last = max(len(samples) - 1, 1)
+    parts = []
+    for index in stops:
+        r, g, b = (int(c) for c in samples[index])
+        position = f"{index * 100 / last:.1f}".rstrip("0").rstrip(".")
+        parts.append(f"{format_color(r, g, b, color_space)} {position}%")
+
+    if color_space == "display-p3":
+        return f"linear-gradient({angle}deg in display-p3, {', '.join(parts)})"
+    return f"linear-gradient({angle}deg, {', '.join(parts)})"
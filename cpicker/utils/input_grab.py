@@ -0,0 +1,132 @@
+"""Pointer and keyboard grab on the root window (no overlay window)."""
+
+from typing import List, Optional, Tuple
+from Xlib import X, Xcursorfont
+
+from .x_connection import XConnection, get_x_connection
+
+
+class InputGrab:
+    """
+    Grab pointer and keyboard on the X root window with a crosshair cursor.
+
+    Replaces the fullscreen overlay: input goes straight to our client and
+    nothing but the magnifier has to be composited. Events are read from
+    the shared X connection with poll_events().
+    """
+
+    POINTER_EVENTS = X.PointerMotionMask | X.ButtonPressMask | X.ButtonReleaseMask
+
+    def __init__(self, connection: Optional[XConnection] = None):
+        """
+        Initialize input grab.
+
+        Args:
+            connection: X connection to grab on (default: shared connection)
+        """
+        self.connection = connection or get_x_connection()
+        self.pointer_grabbed = False
+        self.keyboard_grabbed = False
+        self._cursor = None
+
+    def grab_pointer(self) -> bool:
+        """
+        Grab the pointer with a crosshair cursor.
+
+        Returns:
+            True if the pointer is grabbed
+        """
+        if self.pointer_grabbed:
+            return True
+
+        with self.connection.lock:
+            if self._cursor is None:
+                font = self.connection.display.open_font('cursor')
+                self._cursor = font.create_glyph_cursor(
+                    font, Xcursorfont.crosshair, Xcursorfont.crosshair + 1,
+                    (0, 0, 0), (65535, 65535, 65535)
+                )
+                font.close()
+
+            status = self.connection.root.grab_pointer(
+                False, self.POINTER_EVENTS,
+                X.GrabModeAsync, X.GrabModeAsync,
+                X.NONE, self._cursor, X.CurrentTime
+            )
+
+        self.pointer_grabbed = status == X.GrabSuccess
+        return self.pointer_grabbed
+
+    def grab_keyboard(self) -> bool:
+        """
+        Grab the keyboard.
+
+        May fail while the window manager still holds the activation
+        shortcut; callers should retry.
+
+        Returns:
+            True if the keyboard is grabbed
+        """
+        if self.keyboard_grabbed:
+            return True
+
+        with self.connection.lock:
+            status = self.connection.root.grab_keyboard(
+                False, X.GrabModeAsync, X.GrabModeAsync, X.CurrentTime
+            )
+
+        self.keyboard_grabbed = status == X.GrabSuccess
+        return self.keyboard_grabbed
+
+    def pointer_position(self) -> Tuple[int, int]:
+        """
+        Get the current pointer position.
+
+        Returns:
+            Tuple of (x, y) root window coordinates
+        """
+        with self.connection.lock:
+            pointer = self.connection.root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def poll_events(self) -> List:
+        """
+        Read all pending events without blocking.
+
+        Returns:
+            List of Xlib events in arrival order
+        """
+        events = []
+        with self.connection.lock:
+            while self.connection.display.pending_events():
+                events.append(self.connection.display.next_event())
+        return events
+
+    def keysym(self, keycode: int) -> int:
+        """
+        Get the unshifted keysym for a key event's keycode.
+
+        Args:
+            keycode: Keycode from a key event
+
+        Returns:
+            X keysym
+        """
+        return self.connection.display.keycode_to_keysym(keycode, 0)
+
+    def release(self):
+        """Release any grabs and the cursor."""
+        if self.connection.closed:
+            return
+
+        with self.connection.batch() as disp:
+            if self.pointer_grabbed:
+                disp.ungrab_pointer(X.CurrentTime)
+            if self.keyboard_grabbed:
+                disp.ungrab_keyboard(X.CurrentTime)
+            if self._cursor is not None:
+                self._cursor.free()
+
+        self.pointer_grabbed = False
+        self.keyboard_grabbed = False
+        self._cursor = None
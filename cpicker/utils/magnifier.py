@@ -1,18 +1,30 @@
 """Magnifier widget for cPicker color display."""
 
-from typing import Optional
+from typing import List, Optional, Tuple
 from PyQt6.QtWidgets import QWidget, QApplication
 from PyQt6.QtCore import Qt, QRect
-from PyQt6.QtGui import QPainter, QImage, QPixmap, QPen, QFont, QColor
+from PyQt6.QtGui import QPainter, QImage, QPixmap, QPen, QFont, QFontMetrics, QColor
 from PIL import Image
+import numpy as np
 
 from .theme import (
     MAGNIFIER_SIZE, MAGNIFIER_OFFSET, ZOOM_FACTOR, SOURCE_SIZE,
     THEME_BLUE, THEME_BLUE_SOLID, DARK_BG, WHITE_TEXT, SUBTLE_GRID, SUBTLE_WHITE_GUIDE,
-    HEX_FONT_SIZE, RGB_FONT_SIZE, FONT_FAMILY
+    HEAT_PASS, HEAT_FAIL,
+    HEX_FONT_SIZE, RGB_FONT_SIZE, LABEL_FONT_SIZE, FONT_FAMILY,
+    PALETTE_STRIP_WIDTH, PALETTE_SWATCH_SIZE, PALETTE_SWATCH_GAP
 )
 
 
+# Info panel layout
+INFO_PADDING = 10
+INFO_SWATCH_SIZE = 30
+INFO_SWATCH_GAP = 15        # Between swatch and hex code
+INFO_LINE_GAP = 8           # Between hex row and RGB values
+INFO_MIN_HEIGHT = 80
+HEX_DIGITS = "0123456789ABCDEF"
+
+
 class MagnifierWidget(QWidget):
     """
     Widget that displays a magnified view of screen area with color information.
@@ -24,10 +36,18 @@ class MagnifierWidget(QWidget):
     - Hex color code (large text)
     - RGB values (smaller text)
     - Color swatch
+    - Strip of colors picked so far (session mode only)
+    - Contrast pass/fail heatmap (contrast mode only)
     """
 
-    def __init__(self, parent=None):
-        """Initialize magnifier widget."""
+    def __init__(self, parent=None, show_palette: bool = False):
+        """
+        Initialize magnifier widget.
+
+        Args:
+            parent: Parent widget
+            show_palette: Reserve a strip to the right for session picks
+        """
         super().__init__(parent)
 
         # Window configuration
@@ -37,7 +57,10 @@ class MagnifierWidget(QWidget):
             Qt.WindowType.Tool
         )
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
-        self.setFixedSize(MAGNIFIER_SIZE, MAGNIFIER_SIZE + 80)  # Extra space for text
+        self._layout_info_panel()
+        width = self.panel_width + (PALETTE_STRIP_WIDTH if show_palette else 0)
+        self.setFixedSize(width, MAGNIFIER_SIZE + self.info_height)
+        self.show_palette = show_palette
 
         # State
         self.source_pixmap: Optional[QPixmap] = None
@@ -47,10 +70,59 @@ class MagnifierWidget(QWidget):
         self.current_b: int = 0
         self.cursor_x: int = 0
         self.cursor_y: int = 0
+        self.palette: List[Tuple[int, int, int]] = []
+        self.swatch_rgb: Optional[Tuple[int, int, int]] = None
+        self.color_space_label: Optional[str] = None
+        self.vision_label: Optional[str] = None
+        self.heatmap_pixmap: Optional[QPixmap] = None
+        self.contrast_label: Optional[str] = None
 
         # Screen geometry
         self.screen_geometry = QApplication.primaryScreen().geometry()
 
+    def _layout_info_panel(self):
+        """
+        Size the info panel from the configured fonts.
+
+        The panel is at least as wide as the magnified view and grows to
+        fit the widest possible hex code and RGB line.
+        """
+        self.hex_font = QFont(FONT_FAMILY, HEX_FONT_SIZE, QFont.Weight.Bold)
+        self.rgb_font = QFont(FONT_FAMILY, RGB_FONT_SIZE)
+        self.label_font = QFont(FONT_FAMILY, LABEL_FONT_SIZE)
+        hex_metrics = QFontMetrics(self.hex_font)
+        rgb_metrics = QFontMetrics(self.rgb_font)
+        label_metrics = QFontMetrics(self.label_font)
+
+        # Widest text that can be shown (fonts need not be monospace)
+        widest_hex = max(HEX_DIGITS, key=hex_metrics.horizontalAdvance)
+        widest_digit = max(HEX_DIGITS[:10], key=rgb_metrics.horizontalAdvance)
+        hex_width = hex_metrics.horizontalAdvance("#" + widest_hex * 6)
+        rgb_width = rgb_metrics.horizontalAdvance(self._rgb_text(*(widest_digit * 3,) * 3))
+
+        self.hex_x = INFO_PADDING + INFO_SWATCH_SIZE + INFO_SWATCH_GAP
+        self.panel_width = max(
+            MAGNIFIER_SIZE,
+            self.hex_x + hex_width + INFO_PADDING,
+            INFO_PADDING + rgb_width + INFO_PADDING
+        )
+
+        # Vertical offsets relative to the top of the panel; hex and RGB text
+        # is digits, capitals and punctuation only, so cap height bounds it
+        hex_height = hex_metrics.capHeight()
+        hex_row_height = max(INFO_SWATCH_SIZE, hex_height)
+        self.swatch_y = INFO_PADDING + (hex_row_height - INFO_SWATCH_SIZE) // 2
+        self.hex_baseline = INFO_PADDING + (hex_row_height + hex_height) // 2
+        self.rgb_baseline = (INFO_PADDING + hex_row_height + INFO_LINE_GAP
+                             + rgb_metrics.capHeight())
+        self.label_top = self.rgb_baseline + 2
+        self.info_height = max(INFO_MIN_HEIGHT, self.label_top + label_metrics.height() + 4)
+
+    @staticmethod
+    def _rgb_text(r, g, b) -> str:
+        """Format the RGB values line."""
+        return f"R:{r:>3}  G:{g:>3}  B:{b:>3}"
+
     def update_source(self, source_image: Image.Image):
         """
         Update the source image to magnify.
@@ -83,7 +155,8 @@ class MagnifierWidget(QWidget):
 
         self.update()
 
-    def set_color(self, hex_code: str, r: int, g: int, b: int):
+    def set_color(self, hex_code: str, r: int, g: int, b: int,
+                  swatch_rgb: Optional[Tuple[int, int, int]] = None):
         """
         Set the current color information.
 
@@ -92,11 +165,73 @@ class MagnifierWidget(QWidget):
             r: Red component (0-255)
             g: Green component (0-255)
             b: Blue component (0-255)
+            swatch_rgb: Raw framebuffer color for the swatch, if the
+                displayed values are color-managed
         """
         self.current_hex = hex_code
         self.current_r = r
         self.current_g = g
         self.current_b = b
+        self.swatch_rgb = swatch_rgb
+        self.update()
+
+    def set_color_space(self, label: Optional[str]):
+        """
+        Set the label of the color space the displayed values are in.
+
+        Args:
+            label: Short color space name (e.g., "sRGB"), or None if unmanaged
+        """
+        self.color_space_label = label
+        self.update()
+
+    def set_vision_label(self, label: Optional[str]):
+        """
+        Set the label of the active color vision simulation.
+
+        Args:
+            label: Simulation name (e.g., "Protanopia"), or None if off
+        """
+        self.vision_label = label
+        self.update()
+
+    def set_heatmap(self, status: Optional[np.ndarray], summary: Optional[str] = None):
+        """
+        Set the contrast heatmap drawn over the magnified view.
+
+        Args:
+            status: int8 array (source height × width), 1 = pass, 0 = fail,
+                -1 = no overlay; None removes the heatmap
+            summary: Worst contrast text for the info panel
+        """
+        self.contrast_label = summary
+        if status is None:
+            self.heatmap_pixmap = None
+            self.update()
+            return
+
+        # Build the RGBA overlay in one pass, then scale like the source
+        rgba = np.zeros(status.shape + (4,), dtype=np.uint8)
+        rgba[status == 1] = HEAT_PASS.getRgb()
+        rgba[status == 0] = HEAT_FAIL.getRgb()
+        height, width = status.shape
+        qimage = QImage(rgba.tobytes(), width, height, width * 4, QImage.Format.Format_RGBA8888)
+        self.heatmap_pixmap = QPixmap.fromImage(qimage).scaled(
+            MAGNIFIER_SIZE,
+            MAGNIFIER_SIZE,
+            Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.FastTransformation
+        )
+        self.update()
+
+    def set_palette(self, colors: List[Tuple[int, int, int]]):
+        """
+        Set the colors picked so far in the current session.
+
+        Args:
+            colors: List of (r, g, b) tuples in pick order
+        """
+        self.palette = list(colors)
         self.update()
 
     def position_near_cursor(self, cursor_x: int, cursor_y: int):
@@ -108,7 +243,7 @@ class MagnifierWidget(QWidget):
             cursor_y: Cursor Y coordinate
         """
         # Default: bottom-left of cursor
-        mag_x = cursor_x - MAGNIFIER_SIZE - MAGNIFIER_OFFSET
+        mag_x = cursor_x - self.width() - MAGNIFIER_OFFSET
         mag_y = cursor_y + MAGNIFIER_OFFSET
 
         # Adaptive positioning - flip to opposite sides if off-screen
@@ -140,6 +275,10 @@ class MagnifierWidget(QWidget):
             # The pixmap is already 210×210, so this is a 1:1 copy
             painter.drawPixmap(0, 0, self.source_pixmap)
 
+            # Draw contrast heatmap
+            if self.heatmap_pixmap:
+                painter.drawPixmap(0, 0, self.heatmap_pixmap)
+
             # Draw grid
             self._draw_grid(painter)
 
@@ -149,6 +288,10 @@ class MagnifierWidget(QWidget):
         # Draw color information panel
         self._draw_color_info(painter)
 
+        # Draw session palette strip
+        if self.show_palette:
+            self._draw_palette(painter)
+
     def _draw_grid(self, painter: QPainter):
         """Draw grid overlay on magnified view."""
         pen = QPen(SUBTLE_GRID)
@@ -212,18 +355,23 @@ class MagnifierWidget(QWidget):
 
     def _draw_color_info(self, painter: QPainter):
         """Draw color information panel below magnifier."""
-        # Background panel
+        # Background panel (and the area beside the view if text made it wider)
         info_y = MAGNIFIER_SIZE
-        info_height = 80
+        info_height = self.info_height
 
-        painter.fillRect(0, info_y, MAGNIFIER_SIZE, info_height, DARK_BG)
+        painter.fillRect(0, info_y, self.panel_width, info_height, DARK_BG)
+        if self.panel_width > MAGNIFIER_SIZE:
+            painter.fillRect(MAGNIFIER_SIZE, 0, self.panel_width - MAGNIFIER_SIZE,
+                             MAGNIFIER_SIZE, DARK_BG)
 
         # Color swatch (small square showing actual color)
-        swatch_size = 30
-        swatch_x = 10
-        swatch_y = info_y + 10
+        swatch_size = INFO_SWATCH_SIZE
+        swatch_x = INFO_PADDING
+        swatch_y = info_y + self.swatch_y
 
-        swatch_color = QColor(self.current_r, self.current_g, self.current_b)
+        # Swatch shows the framebuffer color so it matches the screen
+        swatch_rgb = self.swatch_rgb or (self.current_r, self.current_g, self.current_b)
+        swatch_color = QColor(*swatch_rgb)
         painter.fillRect(swatch_x, swatch_y, swatch_size, swatch_size, swatch_color)
 
         # Draw border around swatch
@@ -231,18 +379,50 @@ class MagnifierWidget(QWidget):
         painter.drawRect(swatch_x, swatch_y, swatch_size, swatch_size)
 
         # Hex code (large text)
-        hex_font = QFont(FONT_FAMILY, HEX_FONT_SIZE, QFont.Weight.Bold)
-        painter.setFont(hex_font)
+        painter.setFont(self.hex_font)
         painter.setPen(WHITE_TEXT)
-
-        hex_x = swatch_x + swatch_size + 15
-        hex_y = info_y + 35
-        painter.drawText(hex_x, hex_y, self.current_hex)
+        painter.drawText(self.hex_x, info_y + self.hex_baseline, self.current_hex)
 
         # RGB values (smaller text)
-        rgb_font = QFont(FONT_FAMILY, RGB_FONT_SIZE)
-        painter.setFont(rgb_font)
-
-        rgb_text = f"R:{self.current_r:3d}  G:{self.current_g:3d}  B:{self.current_b:3d}"
-        rgb_y = info_y + 60
-        painter.drawText(10, rgb_y, rgb_text)
+        painter.setFont(self.rgb_font)
+        rgb_text = self._rgb_text(self.current_r, self.current_g, self.current_b)
+        painter.drawText(INFO_PADDING, info_y + self.rgb_baseline, rgb_text)
+
+        # Status labels below the RGB values
+        painter.setFont(self.label_font)
+        label_rect = QRect(INFO_PADDING, info_y + self.label_top,
+                           self.panel_width - 2 * INFO_PADDING, info_height - self.label_top)
+        label_metrics = painter.fontMetrics()
+
+        # Color space of the displayed values (right, color-managed output only)
+        space_width = 0
+        if self.color_space_label:
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             self.color_space_label)
+            space_width = label_metrics.horizontalAdvance(self.color_space_label + "  ")
+
+        # Active color vision simulation and worst contrast (left, elided if too long)
+        status_text = " · ".join(label for label in (self.vision_label, self.contrast_label) if label)
+        if status_text:
+            status_text = label_metrics.elidedText(status_text, Qt.TextElideMode.ElideRight,
+                                                   label_rect.width() - space_width)
+            painter.drawText(label_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             status_text)
+
+    def _draw_palette(self, painter: QPainter):
+        """Draw strip of picked colors to the right of the magnifier."""
+        strip_x = self.panel_width
+        painter.fillRect(strip_x, 0, PALETTE_STRIP_WIDTH, self.height(), DARK_BG)
+
+        # Show the most recent picks that fit, newest at the bottom
+        step = PALETTE_SWATCH_SIZE + PALETTE_SWATCH_GAP
+        max_visible = max(1, (self.height() - PALETTE_SWATCH_GAP) // step)
+        visible = self.palette[-max_visible:]
+
+        swatch_x = strip_x + (PALETTE_STRIP_WIDTH - PALETTE_SWATCH_SIZE) // 2
+        painter.setPen(QPen(WHITE_TEXT, 1))
+        for i, (r, g, b) in enumerate(visible):
+            swatch_y = PALETTE_SWATCH_GAP + i * step
+            painter.fillRect(swatch_x, swatch_y, PALETTE_SWATCH_SIZE, PALETTE_SWATCH_SIZE,
+                             QColor(r, g, b))
+            painter.drawRect(swatch_x, swatch_y, PALETTE_SWATCH_SIZE, PALETTE_SWATCH_SIZE)
@@ -0,0 +1,314 @@
+"""Always-on runtime counters and Prometheus textfile export."""
+
+import os
+import json
+import time
+import fcntl
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Cumulative counters across all runs
+COUNTERS = {
+    "activations": "Picker activations",
+    "frames_captured": "Magnifier frames captured",
+    "frames_skipped": "Magnifier frames skipped (late timer ticks or failed captures)",
+    "x_errors": "X11 errors and failed X requests",
+    "clipboard_failures": "Failed clipboard copies",
+}
+
+# Histograms with fixed bucket upper bounds (seconds)
+HISTOGRAMS = {
+    "capture_latency_seconds": (
+        "Screen capture latency",
+        (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1),
+    ),
+    "first_frame_seconds": (
+        "Time from activation to first magnifier frame",
+        (0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+    ),
+}
+
+# Gauges holding the most recent value
+GAUGES = {
+    "last_activation_timestamp_seconds": "Unix time of the last activation",
+    "last_first_frame_seconds": "Activation to first frame of the last activation",
+}
+
+# Counters from all runs are merged here when a run ends
+METRICS_STATE_PATH = Path.home() / ".local" / "state" / "cpicker" / "metrics.json"
+
+PROMETHEUS_PREFIX = "cpicker_"
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative only on export)."""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        """
+        Initialize histogram.
+
+        Args:
+            bounds: Sorted bucket upper bounds; an +Inf bucket is implied
+        """
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float):
+        """
+        Record a value.
+
+        Args:
+            value: Observed value
+        """
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+
+    @property
+    def count(self) -> int:
+        """Number of observed values."""
+        return sum(self.counts)
+
+
+class Metrics:
+    """
+    Runtime counters of one process.
+
+    All structures are fixed-size: one int per counter, one bucket array
+    per histogram and one float per gauge.
+    """
+
+    def __init__(self):
+        """Initialize all metrics to zero."""
+        self.reset()
+
+    def reset(self):
+        """Reset all metrics to zero."""
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self.histograms: Dict[str, Histogram] = {
+            name: Histogram(bounds) for name, (_, bounds) in HISTOGRAMS.items()
+        }
+        self.gauges: Dict[str, Optional[float]] = {name: None for name in GAUGES}
+        self._activated_at: Optional[float] = None
+
+    def inc(self, name: str, amount: int = 1):
+        """
+        Increment a counter.
+
+        Args:
+            name: Counter name from COUNTERS
+            amount: Increment
+        """
+        self.counters[name] += amount
+
+    def observe(self, name: str, value: float):
+        """
+        Record a histogram value.
+
+        Args:
+            name: Histogram name from HISTOGRAMS
+            value: Observed value
+        """
+        self.histograms[name].observe(value)
+
+    def mark_activation(self):
+        """Record the start of a picker activation."""
+        self._activated_at = time.monotonic()
+        self.inc("activations")
+        self.gauges["last_activation_timestamp_seconds"] = time.time()
+
+    def mark_first_frame(self):
+        """Record activation-to-first-frame time (once per activation)."""
+        if self._activated_at is None:
+            return
+        elapsed = time.monotonic() - self._activated_at
+        self._activated_at = None
+        self.observe("first_frame_seconds", elapsed)
+        self.gauges["last_first_frame_seconds"] = elapsed
+
+    def merge(self, other: "Metrics"):
+        """
+        Add another set of metrics into this one.
+
+        Args:
+            other: Metrics to add (gauges overwrite when set)
+        """
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, histogram in other.histograms.items():
+            mine = self.histograms[name]
+            mine.counts = [a + b for a, b in zip(mine.counts, histogram.counts)]
+            mine.total += histogram.total
+        for name, value in other.gauges.items():
+            if value is not None:
+                self.gauges[name] = value
+
+    def to_dict(self) -> dict:
+        """Serialize for the state file."""
+        return {
+            "counters": self.counters,
+            "histograms": {
+                name: {"counts": h.counts, "sum": h.total}
+                for name, h in self.histograms.items()
+            },
+            "gauges": self.gauges,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Metrics":
+        """
+        Deserialize from the state file, ignoring unknown or resized entries.
+
+        Args:
+            data: Dictionary produced by to_dict()
+
+        Returns:
+            Metrics instance
+        """
+        metrics = cls()
+        for name, value in data.get("counters", {}).items():
+            if name in metrics.counters:
+                metrics.counters[name] = int(value)
+        for name, entry in data.get("histograms", {}).items():
+            histogram = metrics.histograms.get(name)
+            if histogram and len(entry.get("counts", [])) == len(histogram.counts):
+                histogram.counts = [int(c) for c in entry["counts"]]
+                histogram.total = float(entry.get("sum", 0.0))
+        for name, value in data.get("gauges", {}).items():
+            if name in metrics.gauges:
+                metrics.gauges[name] = value
+        return metrics
+
+    def format_text(self) -> str:
+        """Format metrics as a human-readable summary."""
+        lines = []
+        for name, description in COUNTERS.items():
+            lines.append(f"{description + ':':<64} {self.counters[name]}")
+
+        for name, (description, bounds) in HISTOGRAMS.items():
+            histogram = self.histograms[name]
+            if histogram.count:
+                mean_ms = histogram.total / histogram.count * 1000
+                summary = f"{histogram.count} samples, mean {mean_ms:.1f}ms"
+            else:
+                summary = "no samples"
+            lines.append(f"{description + ':':<64} {summary}")
+            labels = [f"<= {bound * 1000:g}ms" for bound in bounds] + [f"> {bounds[-1] * 1000:g}ms"]
+            for label, count in zip(labels, histogram.counts):
+                lines.append(f"    {label:<12} {count}")
+
+        last = self.gauges["last_activation_timestamp_seconds"]
+        if last:
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last))
+            lines.append(f"{'Last activation:':<64} {when}")
+        return "\n".join(lines)
+
+    def format_prometheus(self) -> str:
+        """Format metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, description in COUNTERS.items():
+            metric = f"{PROMETHEUS_PREFIX}{name}_total"
+            lines += [f"# HELP {metric} {description}.", f"# TYPE {metric} counter",
+                      f"{metric} {self.counters[name]}"]
+
+        for name, (description, bounds) in HISTOGRAMS.items():
+            histogram = self.histograms[name]
+            metric = f"{PROMETHEUS_PREFIX}{name}"
+            lines += [f"# HELP {metric} {description}.", f"# TYPE {metric} histogram"]
+            cumulative = 0
+            for bound, count in zip(bounds + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines += [f"{metric}_sum {histogram.total:.6f}", f"{metric}_count {histogram.count}"]
+
+        for name, description in GAUGES.items():
+            value = self.gauges[name]
+            if value is None:
+                continue
+            metric = f"{PROMETHEUS_PREFIX}{name}"
+            lines += [f"# HELP {metric} {description}.", f"# TYPE {metric} gauge",
+                      f"{metric} {value:.6f}"]
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide metrics, flushed to the state file when the picker exits
+METRICS = Metrics()
+
+
+def load_metrics(path: Path = METRICS_STATE_PATH) -> Metrics:
+    """
+    Load the cumulative metrics of all runs.
+
+    Args:
+        path: State file path
+
+    Returns:
+        Metrics (all zero if the state file is missing or unreadable)
+    """
+    try:
+        with open(path, 'r') as f:
+            return Metrics.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return Metrics()
+
+
+def flush_metrics(path: Path = METRICS_STATE_PATH):
+    """
+    Merge this process's metrics into the state file and reset them.
+
+    Args:
+        path: State file path
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a+') as f:
+            # Serialize read-modify-write against concurrent runs
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                total = Metrics.from_dict(json.load(f))
+            except ValueError:
+                total = Metrics()
+            total.merge(METRICS)
+            f.seek(0)
+            f.truncate()
+            json.dump(total.to_dict(), f)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        METRICS.reset()
+    except OSError as e:
+        print(f"Error saving metrics: {e}")
+
+
+def write_textfile(metrics: Metrics, path: str):
+    """
+    Write metrics as a Prometheus textfile (for node-exporter).
+
+    The file is replaced atomically so the exporter never reads a partial
+    file.
+
+    Args:
+        metrics: Metrics to write
+        path: Output .prom file path
+    """
+    target = Path(path).expanduser()
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".cpicker-", suffix=".prom.tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(metrics.format_prometheus())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,162 @@
+"""Decoding of X11 ZPixmap image data for any TrueColor visual."""
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+from Xlib import X
+from PIL import Image
+
+
+# Pillow raw modes for common layouts, keyed by
+# (bits_per_pixel, (red_mask, green_mask, blue_mask), msb_first)
+_RAW_MODES: Dict[Tuple[int, Tuple[int, int, int], bool], str] = {
+    (32, (0xff0000, 0x00ff00, 0x0000ff), False): "BGRX",
+    (32, (0xff0000, 0x00ff00, 0x0000ff), True): "XRGB",
+    (32, (0x0000ff, 0x00ff00, 0xff0000), False): "RGBX",
+    (32, (0x0000ff, 0x00ff00, 0xff0000), True): "XBGR",
+    (24, (0xff0000, 0x00ff00, 0x0000ff), False): "BGR",
+    (24, (0xff0000, 0x00ff00, 0x0000ff), True): "RGB",
+    (24, (0x0000ff, 0x00ff00, 0xff0000), False): "RGB",
+    (24, (0x0000ff, 0x00ff00, 0xff0000), True): "BGR",
+    # No 16-bit modes: Pillow's BGR;16/BGR;15 truncate when expanding to
+    # 8 bits, so RGB565/555 would decode differently than on MSB-first
+    # servers. Every layout with fewer than 8 bits per channel uses the
+    # rounding NumPy path instead.
+}
+
+
+class PixelFormat:
+    """
+    Pixel layout of a TrueColor/DirectColor visual.
+
+    Built once from the visual masks and the server's image byte order,
+    then converts raw ZPixmap data to RGB. Layouts with a matching Pillow
+    raw mode are decoded by Pillow; everything else (16-bit RGB565/555,
+    30-bit deep color, ...) goes through a NumPy bit-unpack with
+    per-channel lookup tables.
+    """
+
+    def __init__(self, depth: int, bits_per_pixel: int, scanline_pad: int,
+                 red_mask: int, green_mask: int, blue_mask: int, msb_first: bool):
+        """
+        Initialize pixel format.
+
+        Args:
+            depth: Visual depth in bits (16, 24, 30, 32)
+            bits_per_pixel: Bits per pixel in ZPixmap data (16, 24, 32)
+            scanline_pad: Row padding in bits
+            red_mask: Visual red mask
+            green_mask: Visual green mask
+            blue_mask: Visual blue mask
+            msb_first: True if the server sends images MSB first
+        """
+        if bits_per_pixel not in (16, 24, 32):
+            raise ValueError(f"Unsupported pixmap format: {bits_per_pixel} bits per pixel")
+        if not (red_mask and green_mask and blue_mask):
+            raise ValueError(f"Unsupported visual: depth {depth} has no RGB masks")
+
+        self.depth = depth
+        self.bits_per_pixel = bits_per_pixel
+        self.scanline_pad = scanline_pad
+        self.masks = (red_mask, green_mask, blue_mask)
+        self.msb_first = msb_first
+
+        self.raw_mode: Optional[str] = _RAW_MODES.get((bits_per_pixel, self.masks, msb_first))
+
+        # Per-channel (shift, max value, 8-bit expansion LUT) for the NumPy path
+        self._channels = []
+        for mask in self.masks:
+            shift = (mask & -mask).bit_length() - 1
+            max_value = mask >> shift
+            lut = np.round(np.arange(max_value + 1) * 255.0 / max_value).astype(np.uint8)
+            self._channels.append((shift, max_value, lut))
+
+    @classmethod
+    def from_display(cls, disp) -> "PixelFormat":
+        """
+        Build the pixel format of the default screen's root visual.
+
+        Args:
+            disp: Xlib display connection
+
+        Returns:
+            PixelFormat for images captured from the root window
+        """
+        screen = disp.screen()
+        depth = screen.root_depth
+
+        visual = None
+        for allowed in screen.allowed_depths:
+            for candidate in allowed.visuals:
+                if candidate.visual_id == screen.root_visual:
+                    visual = candidate
+        if visual is None:
+            raise ValueError(f"Root visual 0x{screen.root_visual:x} not found")
+
+        pixmap_format = None
+        for fmt in disp.info.pixmap_formats:
+            if fmt.depth == depth:
+                pixmap_format = fmt
+        if pixmap_format is None:
+            raise ValueError(f"No pixmap format for depth {depth}")
+
+        return cls(
+            depth,
+            pixmap_format.bits_per_pixel,
+            pixmap_format.scanline_pad,
+            visual.red_mask,
+            visual.green_mask,
+            visual.blue_mask,
+            disp.info.image_byte_order == X.MSBFirst
+        )
+
+    def stride(self, width: int) -> int:
+        """
+        Get the number of bytes per row for a given width.
+
+        Args:
+            width: Image width in pixels
+
+        Returns:
+            Row length in bytes, including scanline padding
+        """
+        bits = width * self.bits_per_pixel
+        return (bits + self.scanline_pad - 1) // self.scanline_pad * self.scanline_pad // 8
+
+    def decode(self, data: bytes, width: int, height: int) -> Image.Image:
+        """
+        Convert raw ZPixmap data to an RGB image.
+
+        Args:
+            data: Raw image bytes from get_image
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            PIL RGB Image
+        """
+        stride = self.stride(width)
+
+        if self.raw_mode:
+            return Image.frombytes("RGB", (width, height), data, "raw", self.raw_mode, stride, 1)
+
+        pixels = self._unpack_pixels(data, width, height, stride)
+        rgb = np.empty((height, width, 3), dtype=np.uint8)
+        for i, (shift, max_value, lut) in enumerate(self._channels):
+            rgb[:, :, i] = lut[(pixels >> shift) & max_value]
+
+        return Image.fromarray(rgb, "RGB")
+
+    def _unpack_pixels(self, data: bytes, width: int, height: int, stride: int) -> np.ndarray:
+        """Read raw bytes as a (height, width) array of pixel values."""
+        if self.bits_per_pixel == 24:
+            rows = np.frombuffer(data, dtype=np.uint8, count=height * stride)
+            rows = rows.reshape(height, stride)[:, :width * 3].reshape(height, width, 3)
+            rows = rows.astype(np.uint32)
+            if self.msb_first:
+                return (rows[:, :, 0] << 16) | (rows[:, :, 1] << 8) | rows[:, :, 2]
+            return (rows[:, :, 2] << 16) | (rows[:, :, 1] << 8) | rows[:, :, 0]
+
+        byte_count = self.bits_per_pixel // 8
+        dtype = np.dtype(f"u{byte_count}").newbyteorder(">" if self.msb_first else "<")
+        rows = np.frombuffer(data, dtype=dtype, count=height * stride // byte_count)
+        return rows.reshape(height, stride // byte_count)[:, :width].astype(np.uint32)
@@ -2,24 +2,40 @@
 
 from PyQt6.QtGui import QColor
 
+from .config import get_config, parse_color
+
+
+# Values come from the user config (defaults match the built-in theme)
+_theme = get_config()["theme"]
+_magnifier = get_config()["magnifier"]
+
 
 # UI Colors (consistent with CaptiX theme)
-THEME_BLUE = QColor(0, 150, 255, 200)           # Highlights and borders
-THEME_BLUE_SOLID = QColor(0, 150, 255, 255)     # Solid blue for center pixel
-DARK_BG = QColor(40, 40, 40, 240)               # Dark background for info display
-WHITE_TEXT = QColor(255, 255, 255, 255)         # Text color
-SUBTLE_GRID = QColor(255, 255, 255, 60)         # Grid lines in magnifier
-SUBTLE_WHITE_GUIDE = QColor(255, 255, 255, 50)  # Crosshair guides
+THEME_BLUE = QColor(*parse_color(_theme["highlight"]))              # Highlights and borders
+THEME_BLUE_SOLID = QColor(*parse_color(_theme["highlight_solid"]))  # Solid blue for center pixel
+DARK_BG = QColor(*parse_color(_theme["background"]))                # Dark background for info display
+WHITE_TEXT = QColor(*parse_color(_theme["text"]))                   # Text color
+SUBTLE_GRID = QColor(*parse_color(_theme["grid"]))                  # Grid lines in magnifier
+SUBTLE_WHITE_GUIDE = QColor(*parse_color(_theme["guide"]))          # Crosshair guides
+HEAT_PASS = QColor(*parse_color(_theme["heat_pass"]))               # Contrast heatmap: passing pixel
+HEAT_FAIL = QColor(*parse_color(_theme["heat_fail"]))               # Contrast heatmap: failing pixel
 
 
 # Magnifier constants
-MAGNIFIER_SIZE = 210        # Display size in pixels (21×21 source at 10x zoom)
-MAGNIFIER_OFFSET = 30       # Distance from cursor
-ZOOM_FACTOR = 10            # Each source pixel = 10×10 display pixels
-SOURCE_SIZE = 21            # Number of source pixels to capture (21×21)
+SOURCE_SIZE = _magnifier["source_size"]         # Number of source pixels to capture (21×21)
+ZOOM_FACTOR = _magnifier["zoom"]                # Each source pixel = 10×10 display pixels
+MAGNIFIER_SIZE = SOURCE_SIZE * ZOOM_FACTOR      # Display size in pixels (21×21 source at 10x zoom)
+MAGNIFIER_OFFSET = _magnifier["offset"]         # Distance from cursor
+
+
+# Session palette strip (multi-pick mode)
+PALETTE_SWATCH_SIZE = _magnifier["palette_swatch_size"]  # Size of each picked color swatch
+PALETTE_STRIP_WIDTH = PALETTE_SWATCH_SIZE + 10           # Width of the strip to the right of the magnifier
+PALETTE_SWATCH_GAP = 4                                   # Vertical gap between swatches
 
 
 # Text styling
-HEX_FONT_SIZE = 24          # Large hex code display
-RGB_FONT_SIZE = 12          # Smaller RGB values display
-FONT_FAMILY = "monospace"   # Monospace font for color codes
+HEX_FONT_SIZE = _theme["hex_font_size"]         # Large hex code display
+RGB_FONT_SIZE = _theme["rgb_font_size"]         # Smaller RGB values display
+LABEL_FONT_SIZE = _theme["label_font_size"]     # Color space label
+FONT_FAMILY = _theme["font_family"]             # Monospace font for color codes
@@ -0,0 +1,125 @@
+"""Shared X11 connection for capture, keyboard monitoring and properties."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from Xlib import X, display
+
+from .metrics import METRICS
+
+
+class XConnection:
+    """
+    Single X11 connection shared by all cPicker subsystems.
+
+    Caches atoms and keycodes so each subsystem does not repeat the round
+    trips. Requests from several threads are
+    serialized through `lock`; `batch()` holds the lock for a group of
+    requests and flushes them in one write.
+    """
+
+    def __init__(self, display_name: Optional[str] = None):
+        """
+        Open the X11 connection.
+
+        Args:
+            display_name: X display to connect to (default: $DISPLAY)
+        """
+        try:
+            self.display = display.Display(display_name)
+        except Exception as e:
+            raise RuntimeError(f"Failed to connect to X11 display: {e}")
+
+        self.screen = self.display.screen()
+        self.root = self.screen.root
+        self.lock = threading.RLock()
+        self.closed = False
+
+        self._atoms: Dict[str, int] = {}
+        self._keycodes: Dict[int, int] = {}
+
+        # Count asynchronous X errors instead of only printing them
+        self.display.set_error_handler(self._on_error)
+
+    def _on_error(self, error, request):
+        """Handle an asynchronous X error."""
+        METRICS.inc("x_errors")
+        print(f"X error: {error}")
+
+    def atom(self, name: str, only_if_exists: bool = False) -> int:
+        """
+        Get an atom by name, interning it at most once.
+
+        Args:
+            name: Atom name (e.g., "_ICC_PROFILE")
+            only_if_exists: Return X.NONE instead of creating the atom
+
+        Returns:
+            Atom id, or X.NONE if it does not exist and only_if_exists is set
+        """
+        atom = self._atoms.get(name)
+        if atom is None:
+            with self.lock:
+                atom = self.display.intern_atom(name, only_if_exists=only_if_exists)
+            # Missing atoms may be created later by another client
+            if atom != X.NONE:
+                self._atoms[name] = atom
+        return atom
+
+    def keycode(self, keysym: int) -> int:
+        """
+        Get the keycode for a keysym.
+
+        Args:
+            keysym: X keysym (e.g., 0xffe1 for Shift_L)
+
+        Returns:
+            Keycode, or 0 if the keysym is not mapped
+        """
+        keycode = self._keycodes.get(keysym)
+        if keycode is None:
+            with self.lock:
+                keycode = self.display.keysym_to_keycode(keysym)
+            self._keycodes[keysym] = keycode
+        return keycode
+
+    @contextmanager
+    def batch(self):
+        """Hold the connection for a group of requests and flush them together."""
+        with self.lock:
+            yield self.display
+            self.display.flush()
+
+    def close(self):
+        """Close the connection. Safe to call more than once."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self.display.close()
+            except Exception:
+                pass
+
+
+# Global instance shared by all subsystems
+_x_connection = None
+_x_connection_lock = threading.Lock()
+
+
+def get_x_connection() -> XConnection:
+    """Get or create the global XConnection instance."""
+    global _x_connection
+    with _x_connection_lock:
+        if _x_connection is None or _x_connection.closed:
+            _x_connection = XConnection()
+        return _x_connection
+
+
+def close_x_connection():
+    """Close the global XConnection instance, if open."""
+    global _x_connection
+    with _x_connection_lock:
+        if _x_connection is not None:
+            _x_connection.close()
+            _x_connection = None
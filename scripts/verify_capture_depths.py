@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Verify screen capture decoding at each X visual depth under Xvfb.
+
+Starts a throwaway Xvfb server per depth, paints a known pattern of color
+bars onto the root window, captures it back through ScreenCapture and
+compares every pixel with the expected (channel-quantized) color.
+
+Usage:
+    ./venv/bin/python scripts/verify_capture_depths.py [DEPTH ...]
+"""
+
+import os
+import sys
+import time
+import shutil
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Xlib import display  # noqa: E402
+
+from cpicker.utils.capture import ScreenCapture  # noqa: E402
+from cpicker.utils.x_connection import XConnection  # noqa: E402
+
+
+DEFAULT_DEPTHS = (16, 24, 30)
+DISPLAY_NUMBER = 97
+BAR_WIDTH = 8
+BAR_HEIGHT = 16
+PATTERN = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255),
+    (0, 0, 0), (18, 52, 86), (171, 205, 239), (128, 64, 32),
+]
+
+
+def pack_pixel(pixel_format, rgb):
+    """Pack an 8-bit RGB color into a pixel value for the given format."""
+    value = 0
+    for mask, channel in zip(pixel_format.masks, rgb):
+        shift = (mask & -mask).bit_length() - 1
+        max_value = mask >> shift
+        value |= ((channel * max_value + 127) // 255) << shift
+    return value
+
+
+def expected_color(pixel_format, rgb):
+    """Get the color a channel-quantized pixel should decode to."""
+    result = []
+    for mask, channel in zip(pixel_format.masks, rgb):
+        shift = (mask & -mask).bit_length() - 1
+        max_value = mask >> shift
+        quantized = (channel * max_value + 127) // 255
+        result.append(round(quantized * 255 / max_value))
+    return tuple(result)
+
+
+def verify_depth(depth: int) -> bool:
+    """
+    Paint and capture the pattern on an Xvfb server of the given depth.
+
+    Args:
+        depth: Screen depth passed to Xvfb
+
+    Returns:
+        True if every captured pixel matches
+    """
+    display_name = f":{DISPLAY_NUMBER}"
+    server = subprocess.Popen(
+        ['Xvfb', display_name, '-screen', '0', f'320x240x{depth}', '-nolisten', 'tcp'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    os.environ['DISPLAY'] = display_name
+
+    # Connections are per server: the shared global connection would
+    # outlive this Xvfb and carry its pixel format into the next depth
+    conn = None
+    connection = None
+
+    try:
+        # Wait for the server to accept connections
+        for _ in range(50):
+            try:
+                conn = display.Display(display_name)
+                break
+            except Exception:
+                time.sleep(0.1)
+        if conn is None:
+            print(f"depth {depth}: Xvfb did not start")
+            return False
+
+        connection = XConnection(display_name)
+        capture = ScreenCapture(connection)
+        pixel_format = capture.pixel_format
+        root = conn.screen().root
+
+        for i, rgb in enumerate(PATTERN):
+            gc = root.create_gc(foreground=pack_pixel(pixel_format, rgb))
+            root.fill_rectangle(gc, i * BAR_WIDTH, 0, BAR_WIDTH, BAR_HEIGHT)
+            gc.free()
+        conn.sync()
+
+        image = capture.capture_region(0, 0, BAR_WIDTH * len(PATTERN), BAR_HEIGHT)
+        if image is None:
+            print(f"depth {depth}: capture failed")
+            return False
+
+        mismatches = 0
+        for i, rgb in enumerate(PATTERN):
+            want = expected_color(pixel_format, rgb)
+            for x in range(i * BAR_WIDTH, (i + 1) * BAR_WIDTH):
+                for y in range(BAR_HEIGHT):
+                    got = image.getpixel((x, y))
+                    if got != want:
+                        if mismatches < 5:
+                            print(f"depth {depth}: ({x}, {y}) got {got}, expected {want}")
+                        mismatches += 1
+
+        path = pixel_format.raw_mode or "numpy"
+        status = "OK" if mismatches == 0 else f"FAILED ({mismatches} pixels)"
+        print(f"depth {depth}: {pixel_format.bits_per_pixel} bpp, "
+              f"masks {[hex(m) for m in pixel_format.masks]}, decoder {path}: {status}")
+
+        return mismatches == 0
+
+    finally:
+        if connection is not None:
+            connection.close()
+        if conn is not None:
+            conn.close()
+        server.terminate()
+        server.wait()
+
+
+def main():
+    """Verify capture decoding at the requested depths."""
+    if not shutil.which('Xvfb'):
+        print("Error: Xvfb not found. Please install it: sudo apt install xvfb")
+        sys.exit(1)
+
+    depths = [int(arg) for arg in sys.argv[1:]] or DEFAULT_DEPTHS
+    results = [verify_depth(depth) for depth in depths]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()